@@ -13,6 +13,7 @@ class ChildrenConfig(AppConfig):
         from naps.models import Nap
 
         from .cache_utils import invalidate_child_activities_cache
+        from .models import Child, ChildShare
 
         def invalidate_on_tracking_change(sender, instance, **kwargs):
             """Invalidate child activities cache when tracking records change."""
@@ -55,3 +56,35 @@ class ChildrenConfig(AppConfig):
             sender=Nap,
             dispatch_uid="invalidate_nap_cache_delete",
         )
+
+        def invalidate_members_on_share_change(sender, instance, **kwargs):
+            """Invalidate a child's cached member IDs when a share changes.
+
+            Signals (rather than ChildShare.delete) also cover shares removed
+            by cascade, e.g. when the shared user is deleted.
+            """
+            Child.invalidate_member_cache(instance.child_id)
+
+        def invalidate_access_on_share_delete(sender, instance, **kwargs):
+            """Invalidate the shared user's accessible children on share delete.
+
+            Also runs for shares cascaded by deleting the child, so shared
+            users never keep a deleted child's ID in their cached set.
+            """
+            Child.invalidate_user_cache(instance.user)
+
+        post_save.connect(
+            invalidate_members_on_share_change,
+            sender=ChildShare,
+            dispatch_uid="invalidate_child_members",
+        )
+        post_delete.connect(
+            invalidate_members_on_share_change,
+            sender=ChildShare,
+            dispatch_uid="invalidate_child_members_delete",
+        )
+        post_delete.connect(
+            invalidate_access_on_share_delete,
+            sender=ChildShare,
+            dispatch_uid="invalidate_shared_user_access_delete",
+        )
@@ -1,14 +1,22 @@
 """Pure Django datetime helpers using the user's timezone (no JavaScript)."""
 
 from datetime import date, datetime, timedelta
+from functools import lru_cache
 from zoneinfo import ZoneInfo
 
 from django.utils import timezone as django_tz
 
+_UTC = ZoneInfo("UTC")
 
+
+@lru_cache(maxsize=128)
 def _user_tz(tz_name: str | None) -> ZoneInfo:
-    """Return ZoneInfo for tz_name, defaulting to UTC."""
-    return ZoneInfo(tz_name) if tz_name else ZoneInfo("UTC")
+    """Return ZoneInfo for tz_name, defaulting to UTC.
+
+    Memoized so form/API conversions don't repeat the ZoneInfo key lookup
+    (and its weak-cache round trip) on every call.
+    """
+    return ZoneInfo(tz_name) if tz_name else _UTC
 
 
 def utc_to_local_datetime_local_str(
@@ -50,7 +58,7 @@ def naive_local_to_utc(
         return None
     tz = _user_tz(tz_name)
     local = naive_dt.replace(tzinfo=tz)
-    return local.astimezone(ZoneInfo("UTC"))
+    return local.astimezone(_UTC)
 
 
 def format_datetime_user_tz(
@@ -133,8 +141,8 @@ def date_to_utc_range(
         tzinfo=tz,
     )
     end_of_day = start_of_day + timedelta(days=1)
-    start_utc = start_of_day.astimezone(ZoneInfo("UTC"))
-    end_utc = end_of_day.astimezone(ZoneInfo("UTC"))
+    start_utc = start_of_day.astimezone(_UTC)
+    end_utc = end_of_day.astimezone(_UTC)
     return start_utc, end_utc
 
 
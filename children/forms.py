@@ -195,10 +195,20 @@ class LocalDateTimeFormMixin(forms.Form):
                 self.initial[field_name] = now_in_user_tz_str(tz)
 
     def _user_tz(self):
-        """Return user's timezone or UTC."""
+        """Return user's timezone or UTC.
+
+        Resolved once per form: __init__ and clean() in both this mixin and
+        subclasses (e.g. NapForm's ended_at handling) all ask for it.
+        """
+        cached = self.__dict__.get("_cached_user_tz")
+        if cached is not None:
+            return cached
         if not self._request or not getattr(self._request, "user", None):
-            return "UTC"
-        return getattr(self._request.user, "timezone", None) or "UTC"
+            tz = "UTC"
+        else:
+            tz = getattr(self._request.user, "timezone", None) or "UTC"
+        self._cached_user_tz = tz
+        return tz
 
     def clean(self):
         """Convert naive datetime from user timezone to UTC and validate not future."""
@@ -1,8 +1,9 @@
 """Permission mixins for child access control.
 
-These mixins implement view-level authorization for child access. They are used in
-conjunction with Child.has_access() and related permission methods to enforce
-role-based access control across the application.
+These mixins implement view-level authorization for child access. They use
+Child.get_user_role() (the same rules as Child.has_access(), can_edit() and
+can_manage_sharing()) to enforce role-based access control across the
+application.
 
 Security model:
 - Returns Http404 (not Http403) to avoid revealing child existence
@@ -90,12 +91,14 @@ class ChildAccessMixin(LoginRequiredMixin):
             return super().dispatch(request, *args, **kwargs)
 
         self.child = self.get_child_for_access_check()
-        if not self.child.has_access(request.user):
+        # The role doubles as the access check (None means no access), so
+        # the owner/share lookup runs once and is reused by
+        # check_child_permission().
+        self.user_role = self.child.get_user_role(request.user)
+        if self.user_role is None:
             # Use 404 to not reveal child existence (security through obscurity)
             raise Http404()
 
-        self.user_role = self.child.get_user_role(request.user)
-
         # Check additional permissions before calling view method
         if not self.check_child_permission(request):
             raise Http404()
@@ -144,7 +147,7 @@ class ChildEditMixin(ChildAccessMixin):
         Returns:
             bool: True if user can edit (owner or co-parent), False if caregiver
         """
-        return self.child.can_edit(request.user)
+        return self.user_role in ("owner", "co-parent")
 
 
 class ChildOwnerMixin(ChildAccessMixin):
@@ -172,4 +175,4 @@ class ChildOwnerMixin(ChildAccessMixin):
         Returns:
             bool: True if user is the child's parent/owner, False otherwise
         """
-        return self.child.can_manage_sharing(request.user)
+        return self.user_role == "owner"
@@ -72,16 +72,6 @@ class ChildShare(models.Model):
 
         Child.invalidate_user_cache(self.user)
 
-    def delete(self, *args: Any, **kwargs: Any) -> tuple[int, dict[str, int]]:
-        """Invalidate shared user's cache when share is deleted."""
-        user = self.user
-        result = super().delete(*args, **kwargs)
-        # Invalidate cache for the shared user
-        from .models import Child
-
-        Child.invalidate_user_cache(user)
-        return result
-
 
 class ShareInvite(models.Model):
     """Reusable invite links for child sharing.
@@ -222,10 +212,11 @@ class Child(models.Model):
         return self.name
 
     def save(self, *args: Any, **kwargs: Any) -> None:
-        """Invalidate parent's cache when child is created/updated."""
+        """Invalidate parent's and member caches when child is created/updated."""
         super().save(*args, **kwargs)
         # Invalidate cache for the parent (owner)
         Child.invalidate_user_cache(self.parent)
+        Child.invalidate_member_cache(self.pk)
 
     def delete(self, *args: Any, **kwargs: Any) -> tuple[int, dict[str, int]]:
         """Invalidate parent's cache when child is deleted."""
@@ -250,31 +241,44 @@ class Child(models.Model):
             QuerySet: Distinct children where user is owner OR has a ChildShare
 
         Performance:
-            - First call: Database query with cache.set() for 1 hour
-            - Subsequent calls: Cache hit (O(1) lookup)
-            - Cache invalidates on: Child/ChildShare create/update/delete
+            - Child IDs come from accessible_ids() (cached for 1 hour)
+            - Cache invalidates on: Child create/update/delete, ChildShare
+              save/delete (including cascades, via signals registered in
+              ChildrenConfig)
         """
-        cache_key = f"accessible_children_{user.id}"
-        cached_ids = cache.get(cache_key)
+        return cls.objects.filter(id__in=cls.accessible_ids(user))
 
-        if cached_ids is not None:
-            # Return cached child IDs as a QuerySet
-            return cls.objects.filter(id__in=cached_ids)
+    @classmethod
+    def accessible_ids(cls, user: CustomUser) -> set[int]:
+        """Get IDs of all children the user has access to (owned or shared).
 
-        # Query database and cache the results
-        queryset = cls.objects.filter(Q(parent=user) | Q(shares__user=user)).distinct()
-        child_ids = list(queryset.values_list("id", flat=True))
+        Backs for_user(); a warm cache answers without any database query.
 
-        # Cache for 1 hour (3600 seconds)
-        cache.set(cache_key, child_ids, 3600)
+        Args:
+            user: User instance to fetch child IDs for
 
-        return queryset
+        Returns:
+            set[int]: IDs of children where user is owner OR has a ChildShare
+        """
+        cache_key = f"accessible_children_{user.id}"
+        cached_ids = cache.get(cache_key)
+
+        if cached_ids is None:
+            cached_ids = list(
+                cls.objects.filter(Q(parent=user) | Q(shares__user=user))
+                .distinct()
+                .values_list("id", flat=True)
+            )
+            cache.set(cache_key, cached_ids, 3600)
+
+        return set(cached_ids)
 
     @classmethod
     def invalidate_user_cache(cls, user: CustomUser) -> None:
         """Invalidate the cached accessible children for a user.
 
-        Called automatically by Child/ChildShare save() and delete() methods.
+        Called automatically by Child save()/delete(), ChildShare save(), and
+        the ChildShare post_delete signal.
         Ensures subsequent for_user() calls fetch fresh data from database.
 
         Args:
@@ -283,6 +287,48 @@ class Child(models.Model):
         cache_key = f"accessible_children_{user.id}"
         cache.delete(cache_key)
 
+    @classmethod
+    def member_ids(cls, child_id: int) -> set[int]:
+        """Get IDs of the owner and all shared users of a child.
+
+        Used to fan out notifications on every tracking event; sharing
+        changes far less often, so the result is cached for 1 hour.
+
+        Args:
+            child_id: ID of the child
+
+        Returns:
+            set[int]: Owner ID plus the user ID of every ChildShare (empty if
+            the child doesn't exist)
+
+        Performance:
+            - Cache invalidates on: Child save, ChildShare save/delete
+              (including cascades, via signals registered in ChildrenConfig)
+        """
+        cache_key = f"child_members_{child_id}"
+        cached_ids = cache.get(cache_key)
+
+        if cached_ids is None:
+            # One row per share (LEFT JOIN), each carrying the owner's ID
+            rows = cls.objects.filter(id=child_id).values_list(
+                "parent_id", "shares__user_id"
+            )
+            cached_ids = list(
+                {user_id for row in rows for user_id in row if user_id is not None}
+            )
+            cache.set(cache_key, cached_ids, 3600)
+
+        return set(cached_ids)
+
+    @classmethod
+    def invalidate_member_cache(cls, child_id: int) -> None:
+        """Invalidate the cached member IDs for a child.
+
+        Args:
+            child_id: ID of the child whose members changed
+        """
+        cache.delete(f"child_members_{child_id}")
+
     def has_access(self, user: CustomUser) -> bool:
         """Check if user has any access to this child (view or manage).
 
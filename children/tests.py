@@ -5,6 +5,7 @@ from zoneinfo import ZoneInfo
 
 from django.contrib.admin.sites import site as admin_site
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.db import IntegrityError
 from django.test import TestCase
 from django.urls import reverse
@@ -649,6 +650,14 @@ class ChildSharingMethodTests(TestCase):
         children = Child.for_user(self.stranger)
         self.assertNotIn(self.child, children)
 
+    def test_deleting_child_clears_shared_users_cached_ids(self):
+        """Cascaded share deletes drop the child from shared users' caches."""
+        self.addCleanup(cache.clear)  # the rollback restores rows, not the cache
+        self.assertIn(self.child.pk, Child.accessible_ids(self.coparent))
+        self.child.delete()
+        with self.assertNumQueries(1):
+            self.assertEqual(Child.accessible_ids(self.coparent), set())
+
 
 class ChildSharingViewTests(TestCase):
     @classmethod
@@ -60,6 +60,15 @@ class DatetimeUtilsTestCase(TestCase):
         self.assertIsNotNone(result)
         self.assertEqual(result.tzinfo, ZoneInfo("UTC"))
 
+    def test_naive_local_to_utc_reuses_zoneinfo(self):
+        """Repeated conversions resolve the timezone name only once."""
+        naive = datetime(2025, 2, 15, 13, 30)
+        naive_local_to_utc(naive, TEST_TZ)
+        with patch("children.datetime_utils.ZoneInfo") as mock_zoneinfo:
+            result = naive_local_to_utc(naive, TEST_TZ)
+        mock_zoneinfo.assert_not_called()
+        self.assertEqual(result, datetime(2025, 2, 15, 18, 30, tzinfo=ZoneInfo("UTC")))
+
     def test_format_datetime_user_tz_none(self):
         """None datetime returns empty string."""
         self.assertEqual(format_datetime_user_tz(None, TEST_TZ), "")
@@ -84,3 +84,38 @@ class TrackingViewSetTopLevelRouteTests(TestCase):
         mock_serializer = MagicMock()
         view.perform_create(mock_serializer)
         mock_serializer.save.assert_called_once_with()
+
+
+class TrackingViewSetAccessibleChildIdsTests(TestCase):
+    """Test per-request caching of accessible child IDs in perform_create."""
+
+    def test_accessible_child_ids_computed_once_per_request(self):
+        """Repeated nested creates reuse the request's accessible child IDs."""
+        from types import SimpleNamespace
+
+        from django.contrib.auth import get_user_model
+
+        from django_project.test_constants import TEST_PASSWORD
+
+        from .models import Child
+
+        user = get_user_model().objects.create_user(
+            username="nestedcreateuser",
+            email="nestedcreate@example.com",
+            password=TEST_PASSWORD,
+        )
+        child = Child.objects.create(
+            parent=user, name="Nested Baby", date_of_birth="2025-01-01"
+        )
+
+        view = DiaperChangeViewSet()
+        view.kwargs = {"child_pk": str(child.pk)}
+        view.request = SimpleNamespace(user=user)
+
+        self.assertEqual(view._accessible_child_ids(), {child.pk})
+        with self.assertNumQueries(0):
+            self.assertEqual(view._accessible_child_ids(), {child.pk})
+
+        mock_serializer = MagicMock()
+        view.perform_create(mock_serializer)
+        mock_serializer.save.assert_called_once_with(child_id=child.pk)
@@ -4,10 +4,14 @@ This class consolidates common test patterns across diapers, feedings, and naps
 API tests to eliminate duplication.
 """
 
+import unittest
 from abc import ABC
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.authtoken.models import Token
 from rest_framework.test import APITestCase
@@ -22,6 +26,7 @@ class BaseTrackingAPITests(ABC, APITestCase):
     This is an abstract base class and will not be run by Django's test runner.
 
     Subclasses must set:
+        __test__ = True: Opt back in to pytest collection
         model: The tracking model class (e.g., DiaperChange, Feeding, Nap)
         app_name: The app name for URL routing (e.g., "diapers", "feedings", "naps")
 
@@ -31,6 +36,10 @@ class BaseTrackingAPITests(ABC, APITestCase):
         create_test_record(): Create a test record and return it
     """
 
+    # pytest collects this class from every module that imports it; opt out
+    # here and back in on each concrete subclass
+    __test__ = False
+
     model: type | None = None  # Must be set by subclass
     app_name: str | None = None  # Must be set by subclass
 
@@ -39,9 +48,21 @@ class BaseTrackingAPITests(ABC, APITestCase):
         """Make this class abstract - won't be collected as a test class."""
         return NotImplemented
 
+    @classmethod
+    def setUpClass(cls):
+        """Skip the base class as a whole under Django's test runner.
+
+        unittest ignores ``__test__``, so every module that imports this
+        class exposes it to the loader; skipping here (instead of per test
+        in setUp) avoids running setUpTestData for tests that never run.
+        """
+        if cls is BaseTrackingAPITests:
+            raise unittest.SkipTest("Base class should not be run directly")
+        super().setUpClass()
+
     @classmethod
     def setUpTestData(cls):
-        """Create users, child, and shares for testing."""
+        """Create users, child, shares, and auth tokens for testing."""
         user_model = get_user_model()
         cls.owner = user_model.objects.create_user(
             username="owner",
@@ -80,16 +101,14 @@ class BaseTrackingAPITests(ABC, APITestCase):
             role=ChildShare.Role.CAREGIVER,
             created_by=cls.owner,
         )
+        cls.owner_token = Token.objects.create(user=cls.owner)
+        cls.coparent_token = Token.objects.create(user=cls.coparent)
+        cls.caregiver_token = Token.objects.create(user=cls.caregiver)
+        cls.stranger_token = Token.objects.create(user=cls.stranger)
 
     def setUp(self):
-        """Create auth tokens for each user."""
-        # Skip if this is the base class itself (not a subclass)
-        if self.__class__ == BaseTrackingAPITests:
-            self.skipTest("Base class should not be run directly")
-        self.owner_token = Token.objects.create(user=self.owner)
-        self.coparent_token = Token.objects.create(user=self.coparent)
-        self.caregiver_token = Token.objects.create(user=self.caregiver)
-        self.stranger_token = Token.objects.create(user=self.stranger)
+        """Authenticate as the owner; tests for other roles switch credentials."""
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.owner_token.key}")
 
     def get_list_url(self):
         """Get the list/create URL for this tracking app."""
@@ -137,14 +156,12 @@ class BaseTrackingAPITests(ABC, APITestCase):
     def test_owner_can_delete(self):
         """Owner can delete records."""
         record = self.create_test_record()
-        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.owner_token.key}")
         response = self.client.delete(self.get_detail_url(record.pk))
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
 
     def test_partial_update(self):
         """Owner can partial update record."""
         record = self.create_test_record()
-        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.owner_token.key}")
         response = self.client.patch(
             self.get_detail_url(record.pk), self.get_create_data()
         )
@@ -153,17 +170,37 @@ class BaseTrackingAPITests(ABC, APITestCase):
     def test_retrieve(self):
         """Can retrieve single record."""
         record = self.create_test_record()
-        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.owner_token.key}")
         response = self.client.get(self.get_detail_url(record.pk))
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
     def test_nonexistent_child_returns_empty(self):
         """Accessing records for nonexistent child returns empty list."""
-        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.owner_token.key}")
         response = self.client.get(f"/api/v1/children/99999/{self.app_name}/")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data["results"]), 0)
 
+    def test_stranger_list_skips_record_queries(self):
+        """Stranger's list is empty without querying the tracking table."""
+        self.create_test_record()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.stranger_token.key}")
+        table = self.model._meta.db_table
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.get_list_url())
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 0)
+        self.assertEqual(response.data["results"], [])
+        self.assertFalse(any(table in q["sql"] for q in ctx.captured_queries))
+
+    def test_shared_user_create_for_deleted_child_returns_404(self):
+        """A warm access cache doesn't let a shared user post to a deleted child."""
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.coparent_token.key}")
+        self.addCleanup(cache.clear)  # the rollback restores rows, not the cache
+        self.client.get(self.get_list_url())  # warm the co-parent's access cache
+        url = self.get_list_url()
+        self.child.delete()
+        response = self.client.post(url, self.get_create_data())
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
     def test_stranger_cannot_create(self):
         """Stranger cannot create records (404 = no access, same as not found)."""
         self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.stranger_token.key}")
@@ -7,17 +7,18 @@ and top-level routes (/tracking/).
 
 from typing import Any, List
 
-from django.db.models import QuerySet
+from django.db.models import Exists, OuterRef, Q, QuerySet
 from django.utils.dateparse import parse_datetime
 from rest_framework import viewsets
 from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
 from django_project.throttles import TrackingCreateThrottle
 
 from .api_permissions import CanEditChild, HasChildAccess
-from .models import Child
+from .models import Child, ChildShare
 
 
 class TrackingViewSet(viewsets.ModelViewSet):
@@ -80,24 +81,31 @@ class TrackingViewSet(viewsets.ModelViewSet):
     def get_queryset(self) -> QuerySet[Any]:
         """Return records for the child, filtered by user access and optional date range."""
         child_pk = self.kwargs.get("child_pk")
-        if child_pk:
-            # Nested route: /children/{child_pk}/tracking/
-            child = Child.for_user(self.request.user).filter(pk=child_pk).first()
-            if child:
-                # Get model class from queryset
-                model = self.queryset.model
-                qs = model.objects.filter(child=child).select_related("child")
-                return self._apply_datetime_filters(qs)
-            # Return empty queryset if no access
-            model = self.queryset.model
-            return model.objects.none()
-
-        # Top-level route: /tracking/ - return all accessible
-        accessible_children = Child.for_user(self.request.user)
+        user = self.request.user
+        # Owner, or any ChildShare (co-parent or caregiver) for the record's
+        # child. EXISTS avoids materializing the accessible child IDs.
+        has_access = Q(child__parent=user) | Exists(
+            ChildShare.objects.filter(child_id=OuterRef("child_id"), user=user)
+        )
         model = self.queryset.model
-        qs = model.objects.filter(child__in=accessible_children).select_related("child")
+        qs = model.objects.filter(has_access).select_related("child")
+        if child_pk:
+            # Nested route: /children/{child_pk}/tracking/ - no rows if no access.
+            qs = qs.filter(child_id=child_pk)
+        # Top-level route: /tracking/ - all accessible records
         return self._apply_datetime_filters(qs)
 
+    def list(self, request: Any, *args: Any, **kwargs: Any) -> Response:
+        """List records, skipping pagination queries for an inaccessible child.
+
+        A nested list for a child the user can't access is always empty, so
+        return the empty page directly instead of running COUNT/SELECT.
+        """
+        child_pk = self.kwargs.get("child_pk")
+        if child_pk and int(child_pk) not in self._accessible_child_ids():
+            return Response({"count": 0, "next": None, "previous": None, "results": []})
+        return super().list(request, *args, **kwargs)
+
     def _apply_datetime_filters(self, queryset: QuerySet[Any]) -> QuerySet[Any]:
         """Apply date range filtering if datetime_filter_field is set.
 
@@ -129,6 +137,17 @@ class TrackingViewSet(viewsets.ModelViewSet):
             return [IsAuthenticated(), CanEditChild()]
         return super().get_permissions()
 
+    def _accessible_child_ids(self) -> set[int]:
+        """Return accessible child IDs for the request user, once per request.
+
+        Cached on the request so repeated access checks are set lookups
+        instead of a query per check.
+        """
+        request = self.request
+        if not hasattr(request, "accessible_child_ids"):
+            request.accessible_child_ids = Child.accessible_ids(request.user)
+        return request.accessible_child_ids
+
     def perform_create(self, serializer: Any) -> None:
         """Set child from URL parameter, invalidate cache, and dispatch notification signal."""
         from notifications.signals import tracking_created
@@ -137,10 +156,9 @@ class TrackingViewSet(viewsets.ModelViewSet):
 
         child_pk = self.kwargs.get("child_pk")
         if child_pk:
-            child = Child.for_user(self.request.user).filter(pk=child_pk).first()
-            if not child:
+            if int(child_pk) not in self._accessible_child_ids():
                 raise NotFound("Child not found")
-            instance = serializer.save(child=child)
+            instance = serializer.save(child_id=int(child_pk))
         else:
             # Top-level route: child must be in request data
             instance = serializer.save()
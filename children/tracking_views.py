@@ -25,7 +25,7 @@ Permission model:
 """
 
 from django.db import models
-from django.db.models import Q
+from django.db.models import Exists, OuterRef, Q
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
 from django.utils.datastructures import MultiValueDict
@@ -59,8 +59,11 @@ class TrackingEditQuerysetMixin:
         1. User is the child's owner (parent), OR
         2. User is a co-parent (has ChildShare with CO_PARENT role)
 
+        Co-parent access is an EXISTS subquery rather than a join on shares,
+        so no DISTINCT is needed to drop duplicate rows.
+
         Returns:
-            QuerySet: Distinct tracking records filtered by permission
+            QuerySet: Tracking records filtered by permission
 
         Example:
             # Owner accessing their own record
@@ -69,19 +72,38 @@ class TrackingEditQuerysetMixin:
             # Co-parent accessing shared child's record
             # DiaperChange where child has ChildShare with CO_PARENT role
         """
-        return self.model.objects.filter(
-            Q(child__parent=self.request.user)
-            | Q(
-                child__shares__user=self.request.user,
-                child__shares__role=ChildShare.Role.CO_PARENT,
+        is_co_parent = Exists(
+            ChildShare.objects.filter(
+                child_id=OuterRef("child_id"),
+                user=self.request.user,
+                role=ChildShare.Role.CO_PARENT,
             )
-        ).distinct()
+        )
+        # The owner filter already joins children_child, so selecting the
+        # child with the record avoids a second query in the access check.
+        return self.model.objects.filter(
+            Q(child__parent=self.request.user) | is_co_parent
+        ).select_related("child")
+
+    def get_object(self, queryset=None):
+        """Fetch the tracking record once per request.
+
+        The access check in dispatch() and the Update/Delete view flow both
+        call get_object(); memoizing avoids a second SELECT for the same pk.
+        """
+        if queryset is not None:
+            return super().get_object(queryset)
+        if not hasattr(self, "_cached_object"):
+            self._cached_object = super().get_object()
+        return self._cached_object
 
     def get_child_for_access_check(self):
         """Get child from the tracking record object.
 
         Used by ChildEditMixin to verify user's permission for this specific child.
-        Extracts child from the tracking record being edited/deleted.
+        Extracts child from the tracking record being edited/deleted; the
+        child is loaded with the record by get_queryset(), so this doesn't
+        query.
 
         Returns:
             Child: The child who owns this tracking record
@@ -209,8 +231,14 @@ class TrackingListView(TrackingListFilterMixin, ChildAccessMixin, ListView):
         return get_object_or_404(Child, pk=self.kwargs["child_pk"])
 
     def get_queryset(self):
-        """Get tracking records for the child, with optional date/type filters from GET."""
-        qs = self.model.objects.filter(child=self.child).select_related("child")
+        """Get tracking records for the child, with optional date/type filters from GET.
+
+        Built from the child's reverse manager (e.g. ``child.naps``) so every
+        row's ``.child`` is set to ``self.child`` without a JOIN or a
+        per-row query.
+        """
+        accessor = self.model._meta.get_field("child").remote_field.get_accessor_name()
+        qs = getattr(self.child, accessor).all()
         if hasattr(self, "apply_list_filters"):
             qs = self.apply_list_filters(qs)
         return qs
@@ -418,6 +446,15 @@ class TrackingDeleteView(TrackingEditQuerysetMixin, ChildEditMixin, DeleteView):
     object: models.Model  # type narrowing for mixin conflict in stubs
     success_url_name: str | None = None  # Must be set by subclass
 
+    def get_queryset(self):
+        """Skip audit timestamps: confirmation and delete never read them.
+
+        Update views load every column: saving an instance with deferred
+        fields only writes the loaded ones, so auto_now on updated_at would
+        be skipped.
+        """
+        return super().get_queryset().defer("created_at", "updated_at")
+
     def get_success_url(self):
         """Generate URL to list view after successful deletion.
 
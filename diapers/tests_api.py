@@ -12,6 +12,8 @@ TEST_DATETIME = "2025-01-15T10:00:00Z"
 class DiaperChangeAPITests(BaseTrackingAPITests):
     """Tests for DiaperChange API endpoints."""
 
+    __test__ = True
+
     model = DiaperChange
     app_name = "diapers"
 
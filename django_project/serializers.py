@@ -0,0 +1,28 @@
+"""Serializer helpers shared across the API apps."""
+
+from typing import Any
+
+from django.utils.functional import cached_property
+
+
+class SerializerCacheMixin:
+    """Cache a serializer's readable fields once per serializer instance.
+
+    DRF builds ``fields`` once, but ``_readable_fields`` is a generator that
+    re-walks and re-filters ``fields`` for every object in
+    ``to_representation``. With ``many=True`` the same child serializer is
+    reused for every row, so caching the list makes that work O(1) per list
+    instead of O(N).
+
+    Example:
+        class NapSerializer(SerializerCacheMixin, serializers.Serializer):
+            ...
+    """
+
+    # Provided by the serializer this is mixed into (annotation only, so it
+    # doesn't shadow DRF's cached ``fields`` property)
+    fields: dict[str, Any]
+
+    @cached_property
+    def _readable_fields(self) -> list[Any]:
+        return [field for field in self.fields.values() if not field.write_only]
@@ -6,6 +6,7 @@ Verifies:
 - Cache is properly cleared on create/update/delete operations
 - Signal-based invalidation works correctly
 - Multiple children caches are isolated
+- Child member IDs cache follows sharing changes
 """
 
 from datetime import datetime
@@ -15,7 +16,7 @@ from django.core.cache import cache
 from django.test import TestCase
 from django.utils import timezone
 
-from children.models import Child
+from children.models import Child, ChildShare
 from diapers.models import DiaperChange
 from django_project.test_constants import TEST_PASSWORD
 from feedings.models import Feeding
@@ -452,3 +453,68 @@ class CacheInvalidationBulkOperationsTests(TestCase):
         # Verify deletion
         count = Feeding.objects.filter(child=self.child).count()
         self.assertEqual(count, 0)
+
+
+class ChildMembersCacheInvalidationTests(TestCase):
+    """Test the cached owner + shared user IDs used for notification fan-out."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create an owner, a shared user, and a child."""
+        cls.parent = User.objects.create_user(
+            username="parent",
+            email="parent@test.com",
+            password=TEST_PASSWORD,
+        )
+        cls.caregiver = User.objects.create_user(
+            username="caregiver",
+            email="caregiver@test.com",
+            password=TEST_PASSWORD,
+        )
+        cls.child = Child.objects.create(
+            parent=cls.parent,
+            name="Test Child",
+            date_of_birth="2024-01-15",
+        )
+        ChildShare.objects.create(
+            child=cls.child, user=cls.caregiver, role=ChildShare.Role.CAREGIVER
+        )
+
+    def setUp(self):
+        """Clear cache before each test."""
+        cache.clear()
+
+    def test_member_ids_cached_after_first_call(self):
+        """Owner and shared users are returned, then served from cache."""
+        with self.assertNumQueries(1):
+            members = Child.member_ids(self.child.id)
+        self.assertEqual(members, {self.parent.id, self.caregiver.id})
+        with self.assertNumQueries(0):
+            self.assertEqual(Child.member_ids(self.child.id), members)
+
+    def test_member_ids_for_unshared_and_missing_child(self):
+        """An unshared child has only its owner; a missing child has no members."""
+        solo = Child.objects.create(
+            parent=self.parent, name="Solo", date_of_birth="2024-01-15"
+        )
+        self.assertEqual(Child.member_ids(solo.id), {self.parent.id})
+        self.assertEqual(Child.member_ids(99999), set())
+
+    def test_share_create_invalidates_member_ids(self):
+        """Adding a share drops the cached member IDs."""
+        Child.member_ids(self.child.id)
+        coparent = User.objects.create_user(
+            username="coparent",
+            email="coparent@test.com",
+            password=TEST_PASSWORD,
+        )
+        ChildShare.objects.create(
+            child=self.child, user=coparent, role=ChildShare.Role.CO_PARENT
+        )
+        self.assertIn(coparent.id, Child.member_ids(self.child.id))
+
+    def test_cascade_share_delete_invalidates_member_ids(self):
+        """Shares removed by deleting the shared user drop the cached member IDs."""
+        Child.member_ids(self.child.id)
+        self.caregiver.delete()
+        self.assertEqual(Child.member_ids(self.child.id), {self.parent.id})
@@ -5,7 +5,8 @@ Overrides production settings for test environment:
 - Uses in-memory cache for local tests
 - Uses Redis cache if available (for GitHub Actions integration tests)
 - Enables eager task execution for Celery
-- Disables migrations for speed
+- Disables migrations for speed (set TEST_WITH_MIGRATIONS=1 to replay them)
+- Uses a fast password hasher
 """
 
 import os
@@ -19,6 +20,28 @@ MIDDLEWARE = [
     m for m in MIDDLEWARE if m != "debug_toolbar.middleware.DebugToolbarMiddleware"
 ]  # noqa: F405
 
+
+class DisableMigrations:
+    """Build test tables straight from models instead of replaying migrations.
+
+    None of the apps ship data migrations, so the resulting schema is the
+    same; only the per-run migration replay is skipped.
+    """
+
+    def __contains__(self, item):
+        return True
+
+    def __getitem__(self, item):
+        return None
+
+
+if not os.environ.get("TEST_WITH_MIGRATIONS"):
+    MIGRATION_MODULES = DisableMigrations()
+
+# create_user() in setUpTestData hashes every password; the default PBKDF2
+# hasher is deliberately slow, which tests don't need.
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
 # Execute Celery tasks synchronously in tests
 CELERY_TASK_ALWAYS_EAGER = True
 CELERY_TASK_EAGER_PROPAGATES = True
@@ -78,6 +101,8 @@ if os.environ.get("DATABASE_HOST"):
             "PASSWORD": os.environ.get("DATABASE_PASSWORD", ""),
             "HOST": os.environ.get("DATABASE_HOST"),
             "PORT": os.environ.get("DATABASE_PORT", "5432"),
+            # Test data is disposable: don't wait for WAL flushes on commit
+            "OPTIONS": {"options": "-c synchronous_commit=off"},
         }
     }
 else:
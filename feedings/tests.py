@@ -4,7 +4,7 @@ from zoneinfo import ZoneInfo
 
 from django.contrib.admin.sites import site as admin_site
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.test import RequestFactory, TestCase
 from django.urls import reverse
 from django.utils import timezone
 
@@ -14,6 +14,7 @@ from django_project.test_constants import TEST_PASSWORD
 from .api import FeedingSerializer
 from .forms import FeedingForm
 from .models import Feeding
+from .views import FeedingUpdateView
 
 TEST_PARENT_EMAIL = "parent@example.com"
 TEST_DATETIME = "2024-02-01T10:30"
@@ -673,6 +674,26 @@ class FeedingViewTests(TestCase):
         self.feeding.refresh_from_db()
         self.assertEqual(self.feeding.amount_oz, 6.0)
 
+    def test_feeding_edit_fetches_object_once(self):
+        """Edit view reuses the record loaded for the access check."""
+        request = RequestFactory().get("/")
+        request.user = self.user
+        view = FeedingUpdateView()
+        view.setup(request, child_pk=self.child.pk, pk=self.feeding.pk)
+        feeding = view.get_object()
+        with self.assertNumQueries(0):
+            self.assertIs(view.get_object(), feeding)
+
+    def test_feeding_edit_access_check_child_needs_no_query(self):
+        """The child for the access check is loaded with the record."""
+        request = RequestFactory().get("/")
+        request.user = self.user
+        view = FeedingUpdateView()
+        view.setup(request, child_pk=self.child.pk, pk=self.feeding.pk)
+        view.get_object()
+        with self.assertNumQueries(0):
+            self.assertEqual(view.get_child_for_access_check(), self.child)
+
     def test_feeding_delete_requires_login(self):
         response = self.client.get(
             reverse(
@@ -711,6 +732,21 @@ class FeedingViewTests(TestCase):
         self.assertEqual(response.status_code, 302)
         self.assertFalse(Feeding.objects.filter(pk=feeding_pk).exists())
 
+    def test_feeding_delete_defers_timestamps(self):
+        """Delete confirmation loads the feeding without audit timestamps."""
+        self.client.login(email=TEST_PARENT_EMAIL, password=TEST_PASSWORD)
+        response = self.client.get(
+            reverse(
+                URL_FEEDING_DELETE,
+                kwargs={"child_pk": self.child.pk, "pk": self.feeding.pk},
+            )
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.context["object"].get_deferred_fields(),
+            {"created_at", "updated_at"},
+        )
+
     def test_child_list_shows_last_feeding(self):
         self.client.login(email=TEST_PARENT_EMAIL, password=TEST_PASSWORD)
         response = self.client.get(reverse("children:child_list"))
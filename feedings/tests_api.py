@@ -13,6 +13,8 @@ TEST_DATETIME = "2025-01-15T10:00:00Z"
 class FeedingAPITests(BaseTrackingAPITests):
     """Tests for Feeding API endpoints."""
 
+    __test__ = True
+
     model = Feeding
     app_name = "feedings"
 
@@ -6,6 +6,8 @@ from .models import Nap
 @admin.register(Nap)
 class NapAdmin(admin.ModelAdmin):
     list_display = ["child", "napped_at", "ended_at", "created_at"]
+    # Child.__str__ reads child.name; join once instead of a query per row
+    list_select_related = ["child"]
     list_filter = ["napped_at", "ended_at", "created_at"]
     search_fields = ["child__name", "child__parent__email"]
     date_hierarchy = "napped_at"
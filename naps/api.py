@@ -4,36 +4,34 @@ from django.utils import timezone
 from rest_framework import serializers
 from rest_framework.routers import DefaultRouter
 
+from children.models import Child
 from children.tracking_api import TrackingViewSet
+from django_project.serializers import SerializerCacheMixin
 
-from .models import Nap
+from .models import Nap, NapDurationMinutes
 
 
-class NapSerializer(serializers.ModelSerializer):
-    """Nap serializer."""
+class NapSerializer(SerializerCacheMixin, serializers.Serializer):
+    """Nap serializer.
 
+    Fields are declared explicitly instead of via ModelSerializer, so DRF
+    doesn't introspect model metadata to build them on every request.
+    """
+
+    id = serializers.IntegerField(read_only=True)
+    child = serializers.PrimaryKeyRelatedField(queryset=Child.objects.all())
     child_name = serializers.CharField(source="child.name", read_only=True)
-    duration_minutes = serializers.FloatField(read_only=True)
-
-    class Meta:
-        model = Nap
-        fields = [
-            "id",
-            "child",
-            "child_name",
-            "napped_at",
-            "ended_at",
-            "duration_minutes",
-            "created_at",
-            "updated_at",
-        ]
-        read_only_fields = [
-            "id",
-            "child_name",
-            "duration_minutes",
-            "created_at",
-            "updated_at",
-        ]
+    napped_at = serializers.DateTimeField()
+    ended_at = serializers.DateTimeField(required=False, allow_null=True)
+    duration_minutes = serializers.SerializerMethodField()
+    created_at = serializers.DateTimeField(read_only=True)
+    updated_at = serializers.DateTimeField(read_only=True)
+
+    def get_duration_minutes(self, obj):
+        """Prefer the SQL-computed duration when the queryset annotated one."""
+        if hasattr(obj, "annotated_duration_minutes"):
+            return obj.annotated_duration_minutes
+        return obj.duration_minutes
 
     def validate(self, data):
         """Validate nap datetime fields.
@@ -77,37 +75,99 @@ class NapSerializer(serializers.ModelSerializer):
             )
         return data
 
+    def create(self, validated_data):
+        return Nap.objects.create(**validated_data)
+
+    def update(self, instance, validated_data):
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save()
+        return instance
+
 
 class NestedNapSerializer(NapSerializer):
     """Nap serializer for nested routes (child from URL)."""
 
-    class Meta(NapSerializer.Meta):
-        fields = [
-            "id",
-            "napped_at",
-            "ended_at",
-            "duration_minutes",
-            "created_at",
-            "updated_at",
-        ]
-        read_only_fields = ["id", "duration_minutes", "created_at", "updated_at"]
+    child = None
+    child_name = None
 
 
 class NapViewSet(TrackingViewSet):
-    """ViewSet for Nap CRUD (nested under children)."""
+    """ViewSet for Nap CRUD (nested under children).
+
+    The list endpoint accepts a sparse fieldset, e.g. ``?fields=id,napped_at``,
+    to return (and fetch) only the named fields. Unknown names are ignored.
+    """
 
     queryset = Nap.objects.all()
     serializer_class = NapSerializer
     nested_serializer_class = NestedNapSerializer
     datetime_filter_field = "napped_at"
 
+    # Model columns each serializer field reads from
+    field_columns = {
+        "id": ("id",),
+        "child": ("child_id",),
+        "child_name": ("child_id",),
+        "napped_at": ("napped_at",),
+        "ended_at": ("ended_at",),
+        "duration_minutes": ("napped_at", "ended_at"),
+        "created_at": ("created_at",),
+        "updated_at": ("updated_at",),
+    }
+
+    def _requested_fields(self):
+        """Return the ``?fields=`` names for list requests, or None for all."""
+        if self.action != "list":
+            return None
+        param = self.request.query_params.get("fields")
+        if not param:
+            return None
+        requested = {name.strip() for name in param.split(",")}
+        requested &= set(self.get_serializer_class()._declared_fields)
+        return requested or None
+
+    def get_serializer(self, *args, **kwargs):
+        """Drop fields the client didn't ask for via ``?fields=``."""
+        serializer = super().get_serializer(*args, **kwargs)
+        requested = self._requested_fields()
+        if requested:
+            target = (
+                serializer.child
+                if isinstance(serializer, serializers.ListSerializer)
+                else serializer
+            )
+            for name in set(target.fields) - requested:
+                target.fields.pop(name)
+        return serializer
+
     def get_queryset(self):
         """Optimize queryset to fetch only needed columns."""
         base_queryset = super().get_queryset()
-        # Only fetch columns used by serializers
-        return base_queryset.only(
-            "id", "child_id", "napped_at", "ended_at", "created_at", "updated_at"
-        )
+        requested = self._requested_fields()
+        if requested:
+            # child_id is always loaded for select_related("child")
+            columns = {"id", "child_id"}
+            for name in requested:
+                columns.update(self.field_columns[name])
+        else:
+            # Only fetch columns used by serializers
+            columns = (
+                "id",
+                "child_id",
+                "napped_at",
+                "ended_at",
+                "created_at",
+                "updated_at",
+            )
+        queryset = base_queryset.only(*columns)
+        if self.action in ("list", "retrieve"):
+            # Compute durations in SQL for read-only responses. Writes skip
+            # this so the response reflects the saved ended_at.
+            queryset = queryset.annotate(
+                annotated_duration_minutes=NapDurationMinutes()
+            )
+        return queryset
 
 
 # Router for top-level /naps/ endpoint
@@ -0,0 +1,21 @@
+# Generated by Django 6.0 on 2026-10-17 12:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("naps", "0004_add_child_datetime_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="nap",
+            index=models.Index(
+                condition=models.Q(("ended_at__isnull", True)),
+                fields=["child", "napped_at"],
+                name="nap_open_by_child_idx",
+            ),
+        ),
+    ]
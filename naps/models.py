@@ -1,9 +1,33 @@
 from django.db import models
-from django.db.models import CheckConstraint, Q
+from django.db.models import CheckConstraint, F, FloatField, Func, Q
+from django.db.models.functions import Now
 
 from children.models import Child
 
 
+class NapDurationMinutes(Func):
+    """SQL expression for (ended_at - napped_at) in minutes (NULL if open).
+
+    Lets list queries compute durations in the database instead of doing
+    datetime arithmetic per row in Python.
+    """
+
+    template = "EXTRACT(EPOCH FROM %(expressions)s) / 60"
+    output_field = FloatField()
+
+    def __init__(self, **extra):
+        super().__init__(F("ended_at") - F("napped_at"), **extra)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        # SQLite timestamp differences are returned in microseconds
+        return self.as_sql(
+            compiler,
+            connection,
+            template="%(expressions)s / 60000000.0",
+            **extra_context,
+        )
+
+
 class Nap(models.Model):
     """Nap tracking record.
 
@@ -33,6 +57,13 @@ class Nap(models.Model):
         ordering = ["-napped_at"]
         indexes = [
             models.Index(fields=["child", "napped_at"]),
+            # Partial index for auto-ending open naps (signals.py): only open
+            # naps are indexed, so the lookup touches 0-1 rows per child.
+            models.Index(
+                fields=["child", "napped_at"],
+                condition=Q(ended_at__isnull=True),
+                name="nap_open_by_child_idx",
+            ),
         ]
         constraints = [
             CheckConstraint(
@@ -45,6 +76,26 @@ class Nap(models.Model):
     def __str__(self):
         return f"{self.child.name} - Nap"
 
+    @classmethod
+    def end_open_before(cls, child_id, activity_timestamp):
+        """End a child's open naps that started before the activity timestamp.
+
+        A nap never ends itself: its own napped_at is not before itself.
+        updated_at is set by the database clock in the same UPDATE.
+
+        Args:
+            child_id: The child whose open naps should be ended
+            activity_timestamp: The timestamp to set as ended_at
+
+        Returns:
+            int: Number of naps ended
+        """
+        return cls.objects.filter(
+            child_id=child_id,
+            ended_at__isnull=True,
+            napped_at__lt=activity_timestamp,
+        ).update(ended_at=activity_timestamp, updated_at=Now())
+
     @property
     def duration_minutes(self):
         """Calculate nap duration in minutes, or None if nap hasn't ended."""
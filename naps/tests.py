@@ -1,19 +1,25 @@
 from datetime import date, datetime, timedelta
+from unittest.mock import ANY, patch
 from zoneinfo import ZoneInfo
 
 from django.contrib.admin.sites import site as admin_site
 from django.contrib.auth import get_user_model
-from django.db import IntegrityError
-from django.test import TestCase
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import IntegrityError, connection, transaction
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
+from children.datetime_utils import naive_local_to_utc
 from children.models import Child, ChildShare
 from django_project.test_constants import TEST_PASSWORD
 
 from .api import NapSerializer
 from .forms import NapForm
-from .models import Nap
+from .models import Nap, NapDurationMinutes
+from .views import NapCreateView, NapDeleteView, NapListView, NapUpdateView
 
 TEST_PARENT_EMAIL = "parent@example.com"
 URL_NAP_LIST = "naps:nap_list"
@@ -22,7 +28,9 @@ URL_NAP_EDIT = "naps:nap_edit"
 URL_NAP_DELETE = "naps:nap_delete"
 
 
-class NapModelTests(TestCase):
+class NapTestDataMixin:
+    """Owner and child fixtures shared by the nap test classes."""
+
     @classmethod
     def setUpTestData(cls):
         cls.user = get_user_model().objects.create_user(
@@ -36,6 +44,9 @@ class NapModelTests(TestCase):
             date_of_birth=date(2025, 6, 15),
         )
 
+
+class NapModelTests(NapTestDataMixin, TestCase):
+
     def test_nap_creation(self):
         nap = Nap.objects.create(
             child=self.child,
@@ -51,13 +62,12 @@ class NapModelTests(TestCase):
         self.assertEqual(str(nap), "Baby Jane - Nap")
 
     def test_nap_ordering(self):
-        first_nap = Nap.objects.create(
-            child=self.child,
-            napped_at=timezone.now() - timezone.timedelta(hours=2),
-        )
-        second_nap = Nap.objects.create(
-            child=self.child,
-            napped_at=timezone.now(),
+        now = timezone.now()
+        first_nap, second_nap = Nap.objects.bulk_create(
+            [
+                Nap(child=self.child, napped_at=now - timedelta(hours=2)),
+                Nap(child=self.child, napped_at=now),
+            ]
         )
         naps = list(Nap.objects.all())
         self.assertEqual(naps[0], second_nap)
@@ -110,7 +120,7 @@ class NapModelTests(TestCase):
             napped_at=now,
             ended_at=now + timedelta(minutes=90),
         )
-        self.assertAlmostEqual(nap.duration_minutes, 90.0)
+        self.assertEqual(nap.duration_minutes, 90.0)
 
     def test_duration_none_without_ended_at(self):
         nap = Nap.objects.create(
@@ -119,6 +129,37 @@ class NapModelTests(TestCase):
         )
         self.assertIsNone(nap.duration_minutes)
 
+    def test_duration_minutes_annotation(self):
+        """NapDurationMinutes computes the same duration in SQL."""
+        now = timezone.now()
+        ended = Nap.objects.create(
+            child=self.child,
+            napped_at=now - timedelta(minutes=90),
+            ended_at=now,
+        )
+        ongoing = Nap.objects.create(child=self.child, napped_at=now)
+        naps = {
+            nap.pk: nap
+            for nap in Nap.objects.annotate(
+                annotated_duration_minutes=NapDurationMinutes()
+            )
+        }
+        self.assertAlmostEqual(naps[ended.pk].annotated_duration_minutes, 90.0)
+        self.assertIsNone(naps[ongoing.pk].annotated_duration_minutes)
+
+    def test_duration_minutes_follows_ended_at_on_annotated_instance(self):
+        """The property computes from the fields, not a stale annotation."""
+        now = timezone.now()
+        Nap.objects.create(
+            child=self.child, napped_at=now - timedelta(minutes=90), ended_at=now
+        )
+        nap = Nap.objects.annotate(
+            annotated_duration_minutes=NapDurationMinutes()
+        ).get()
+        nap.ended_at = now - timedelta(minutes=60)
+        self.assertAlmostEqual(nap.duration_minutes, 30.0)
+        self.assertEqual(nap.duration_display, "30m")
+
     def test_duration_display_none_when_ongoing(self):
         """duration_display is None when nap has no ended_at (ongoing)."""
         nap = Nap.objects.create(
@@ -139,18 +180,46 @@ class NapModelTests(TestCase):
 
     def test_check_constraint_ended_before_start(self):
         now = timezone.now()
-        with self.assertRaises(IntegrityError):
+        # Savepoint so the failed INSERT doesn't break the test transaction
+        with self.assertRaises(IntegrityError), transaction.atomic():
             Nap.objects.create(
                 child=self.child,
                 napped_at=now,
                 ended_at=now - timedelta(hours=1),
             )
+        self.assertFalse(Nap.objects.filter(child=self.child).exists())
 
 
 class NapAdminTests(TestCase):
     def test_nap_admin_registered(self):
         self.assertIn(Nap, admin_site._registry)
 
+    def test_nap_admin_changelist_queries_independent_of_children(self):
+        """Changelist joins child, so list_display doesn't query per row."""
+        admin = get_user_model().objects.create_superuser(
+            username="admin", email="admin@example.com", password=TEST_PASSWORD
+        )
+        self.client.force_login(admin)
+        url = reverse("admin:naps_nap_changelist")
+        now = timezone.now()
+
+        def add_nap(name):
+            child = Child.objects.create(
+                parent=admin, name=name, date_of_birth=date(2025, 1, 1)
+            )
+            Nap.objects.create(child=child, napped_at=now)
+
+        add_nap("Baby 0")
+        self.client.get(url)  # warm the cached unread-notification count
+        with CaptureQueriesContext(connection) as one_child:
+            self.client.get(url)
+        for i in range(1, 4):
+            add_nap(f"Baby {i}")
+        with CaptureQueriesContext(connection) as four_children:
+            response = self.client.get(url)
+        self.assertContains(response, "Baby 3")
+        self.assertEqual(len(four_children), len(one_child))
+
 
 class NapFormTests(TestCase):
     def test_valid_form(self):
@@ -172,8 +241,6 @@ class NapFormTests(TestCase):
 
     def test_form_initializes_ended_at_from_instance_when_editing(self):
         """Edit form pre-fills ended_at in user timezone when nap has ended_at."""
-        from django.test import RequestFactory
-
         user = get_user_model().objects.create_user(
             username="tzuser",
             email="tz@example.com",
@@ -197,8 +264,6 @@ class NapFormTests(TestCase):
 
     def test_form_converts_local_time_to_utc(self):
         """Form interprets submitted datetime in user's timezone and converts to UTC."""
-        from django.test import RequestFactory
-
         user = get_user_model().objects.create_user(
             username="koluser",
             email="kol@example.com",
@@ -248,8 +313,6 @@ class NapFormTests(TestCase):
 
     def test_form_converts_ended_at_to_utc(self):
         """Ended_at is converted from user timezone to UTC."""
-        from django.test import RequestFactory
-
         user = get_user_model().objects.create_user(
             username="koluser2",
             email="kol2@example.com",
@@ -272,8 +335,6 @@ class NapFormTests(TestCase):
 
     def test_form_utc_user_keeps_submitted_times_as_utc(self):
         """With user timezone UTC, submitted local times equal cleaned UTC."""
-        from django.test import RequestFactory
-
         user = get_user_model().objects.create_user(
             username="utcuser",
             email="utc@example.com",
@@ -295,6 +356,43 @@ class NapFormTests(TestCase):
         self.assertEqual(form.cleaned_data["ended_at"].hour, 11)
         self.assertEqual(form.cleaned_data["ended_at"].minute, 30)
 
+    def test_form_resolves_user_timezone_once(self):
+        """User timezone is read once even though init and clean both use it."""
+        user = get_user_model().objects.create_user(
+            username="tzonceuser",
+            email="tzonce@example.com",
+            password=TEST_PASSWORD,
+            timezone="Asia/Kolkata",
+        )
+        nap = Nap.objects.create(
+            child=Child.objects.create(
+                parent=user, name="Tz Baby", date_of_birth=date(2025, 1, 1)
+            ),
+            napped_at=timezone.now() - timedelta(hours=2),
+            ended_at=timezone.now() - timedelta(hours=1),
+        )
+        request = RequestFactory().get("/")
+        request.user = user
+        form = NapForm(
+            request=request,
+            instance=nap,
+            data={
+                "napped_at": "2024-02-01T14:00",
+                "ended_at": "2024-02-01T15:30",
+            },
+        )
+        # A change after __init__ is not picked up: clean() reuses the tz
+        user.timezone = "UTC"
+        with patch(
+            "naps.forms.naive_local_to_utc", wraps=naive_local_to_utc
+        ) as convert:
+            self.assertTrue(form.is_valid())
+        convert.assert_called_once_with(ANY, "Asia/Kolkata")
+        # 14:00 IST is 08:30 UTC
+        self.assertEqual(form.cleaned_data["napped_at"].hour, 8)
+        self.assertEqual(form.cleaned_data["napped_at"].minute, 30)
+        self.assertEqual(form.cleaned_data["ended_at"].hour, 10)
+
     def test_form_no_request_uses_utc(self):
         """When request is omitted, form uses UTC for conversion."""
         form = NapForm(
@@ -308,8 +406,6 @@ class NapFormTests(TestCase):
 
     def test_form_rejects_future_ended_at(self):
         """Ended_at in the future (user timezone) is rejected."""
-        from django.test import RequestFactory
-
         user = get_user_model().objects.create_user(
             username="utcuser_futureend",
             email="utc_futureend@example.com",
@@ -368,55 +464,86 @@ class NapFormTests(TestCase):
         )
 
 
-class NapViewTests(TestCase):
+class NapViewTests(NapTestDataMixin, TestCase):
     @classmethod
     def setUpTestData(cls):
-        cls.user = get_user_model().objects.create_user(
-            username="testparent",
-            email=TEST_PARENT_EMAIL,
-            password=TEST_PASSWORD,
-        )
+        super().setUpTestData()
         cls.other_user = get_user_model().objects.create_user(
             username="otherparent",
             email="other@example.com",
             password=TEST_PASSWORD,
         )
-        cls.child = Child.objects.create(
-            parent=cls.user,
-            name="Baby Jane",
-            date_of_birth=date(2025, 6, 15),
-        )
         cls.other_child = Child.objects.create(
             parent=cls.other_user,
             name="Other Baby",
             date_of_birth=date(2025, 1, 1),
         )
-        cls.nap = Nap.objects.create(
+        cls.nap = Nap.objects.create(child=cls.child, napped_at=timezone.now())
+        cls.coparent = get_user_model().objects.create_user(
+            username="coparent",
+            email="coparent@example.com",
+            password=TEST_PASSWORD,
+        )
+        ChildShare.objects.create(
             child=cls.child,
-            napped_at=timezone.now(),
+            user=cls.coparent,
+            role=ChildShare.Role.CO_PARENT,
+            created_by=cls.user,
         )
+        # Resolve the URLs used across tests once per class
+        cls.url_list = reverse(URL_NAP_LIST, kwargs={"child_pk": cls.child.pk})
+        cls.url_add = reverse(URL_NAP_ADD, kwargs={"child_pk": cls.child.pk})
+        nap_kwargs = {"child_pk": cls.child.pk, "pk": cls.nap.pk}
+        cls.url_edit = reverse(URL_NAP_EDIT, kwargs=nap_kwargs)
+        cls.url_delete = reverse(URL_NAP_DELETE, kwargs=nap_kwargs)
 
     def test_nap_list_requires_login(self):
-        response = self.client.get(
-            reverse(URL_NAP_LIST, kwargs={"child_pk": self.child.pk})
-        )
+        response = self.client.get(self.url_list)
         self.assertEqual(response.status_code, 302)
 
+    def test_anonymous_redirect_skips_child_lookup(self):
+        """The login redirect happens before ChildAccessMixin loads the child."""
+        for view, url in ((NapListView, self.url_list), (NapCreateView, self.url_add)):
+            request = RequestFactory().get(url)
+            request.user = AnonymousUser()
+            with self.assertNumQueries(0):
+                response = view.as_view()(request, child_pk=self.child.pk)
+            self.assertEqual(response.status_code, 302)
+
     def test_nap_list_only_own_child(self):
-        self.client.login(email=TEST_PARENT_EMAIL, password=TEST_PASSWORD)
+        self.client.force_login(self.user)
         response = self.client.get(
             reverse(URL_NAP_LIST, kwargs={"child_pk": self.other_child.pk})
         )
         self.assertEqual(response.status_code, 404)
 
     def test_nap_list_shows_naps(self):
+        cache.clear()  # Cold cache so the query count is deterministic
+        # Keep one credential login to cover the email/password auth path
         self.client.login(email=TEST_PARENT_EMAIL, password=TEST_PASSWORD)
-        response = self.client.get(
-            reverse(URL_NAP_LIST, kwargs={"child_pk": self.child.pk})
+        now = timezone.now()
+        Nap.objects.bulk_create(
+            [Nap(child=self.child, napped_at=now - timedelta(hours=h)) for h in (1, 2)]
         )
+        # Fixed count regardless of row count: user, child, owner, COUNT,
+        # unread notifications, page of naps
+        with self.assertNumQueries(6):
+            response = self.client.get(self.url_list)
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, "Nap")
 
+    def test_nap_list_queryset_reuses_child_without_join(self):
+        """Listed naps share the view's child instead of joining or refetching it."""
+        request = RequestFactory().get(self.url_list)
+        request.user = self.user
+        view = NapListView()
+        view.setup(request, child_pk=self.child.pk)
+        view.child = self.child
+        qs = view.get_queryset()
+        self.assertNotIn("JOIN", str(qs.query))
+        with self.assertNumQueries(1):
+            self.assertTrue(all(nap.child is self.child for nap in qs))
+
     def test_nap_list_filter_by_date_range(self):
         """List can be filtered by date_from and date_to (user timezone)."""
         user = get_user_model().objects.create_user(
@@ -430,19 +557,23 @@ class NapViewTests(TestCase):
             name="Filter Baby",
             date_of_birth=date(2025, 1, 1),
         )
-        Nap.objects.create(
-            child=child,
-            napped_at=timezone.make_aware(
-                datetime(2025, 2, 14, 23, 0), ZoneInfo("UTC")
-            ),
-        )
-        Nap.objects.create(
-            child=child,
-            napped_at=timezone.make_aware(
-                datetime(2025, 2, 15, 14, 0), ZoneInfo("UTC")
-            ),
-        )
-        self.client.login(email="filteruser@example.com", password=TEST_PASSWORD)
+        Nap.objects.bulk_create(
+            [
+                Nap(
+                    child=child,
+                    napped_at=timezone.make_aware(
+                        datetime(2025, 2, 14, 23, 0), ZoneInfo("UTC")
+                    ),
+                ),
+                Nap(
+                    child=child,
+                    napped_at=timezone.make_aware(
+                        datetime(2025, 2, 15, 14, 0), ZoneInfo("UTC")
+                    ),
+                ),
+            ]
+        )
+        self.client.force_login(user)
         response = self.client.get(
             reverse(URL_NAP_LIST, kwargs={"child_pk": child.pk}),
             {"date_from": "2025-02-15", "date_to": "2025-02-15"},
@@ -453,35 +584,31 @@ class NapViewTests(TestCase):
         self.assertEqual(response.context["naps"][0].napped_at.day, 15)
 
     def test_nap_create_requires_login(self):
-        response = self.client.get(
-            reverse(URL_NAP_ADD, kwargs={"child_pk": self.child.pk})
-        )
+        response = self.client.get(self.url_add)
         self.assertEqual(response.status_code, 302)
 
     def test_nap_create_only_own_child(self):
-        self.client.login(email=TEST_PARENT_EMAIL, password=TEST_PASSWORD)
+        self.client.force_login(self.user)
         response = self.client.get(
             reverse(URL_NAP_ADD, kwargs={"child_pk": self.other_child.pk})
         )
         self.assertEqual(response.status_code, 404)
 
     def test_nap_create_adds_nap(self):
-        self.client.login(email=TEST_PARENT_EMAIL, password=TEST_PASSWORD)
+        self.client.force_login(self.user)
         response = self.client.post(
-            reverse(URL_NAP_ADD, kwargs={"child_pk": self.child.pk}),
+            self.url_add,
             {"napped_at": "2024-02-01T14:00"},
         )
         self.assertEqual(response.status_code, 302)
         self.assertEqual(Nap.objects.filter(child=self.child).count(), 2)
 
     def test_nap_edit_requires_login(self):
-        response = self.client.get(
-            reverse(URL_NAP_EDIT, kwargs={"child_pk": self.child.pk, "pk": self.nap.pk})
-        )
+        response = self.client.get(self.url_edit)
         self.assertEqual(response.status_code, 302)
 
     def test_nap_edit_only_own_nap(self):
-        self.client.login(email=TEST_PARENT_EMAIL, password=TEST_PASSWORD)
+        self.client.force_login(self.user)
         other_nap = Nap.objects.create(
             child=self.other_child,
             napped_at=timezone.now(),
@@ -495,27 +622,28 @@ class NapViewTests(TestCase):
         self.assertEqual(response.status_code, 404)
 
     def test_nap_edit_updates_nap(self):
-        self.client.login(email=TEST_PARENT_EMAIL, password=TEST_PASSWORD)
-        response = self.client.post(
-            reverse(
-                URL_NAP_EDIT, kwargs={"child_pk": self.child.pk, "pk": self.nap.pk}
-            ),
-            {"napped_at": "2024-02-01T15:00"},
-        )
+        # Call the view directly: only the saved state is under test here,
+        # the HTTP stack is covered by test_coparent_can_edit_nap.
+        request = RequestFactory().post(
+            self.url_edit, {"napped_at": "2024-02-01T15:00"}
+        )
+        request.user = self.user
+        # nap+child, owner, savepoint/check/release, UPDATE
+        with self.assertNumQueries(6):
+            response = NapUpdateView.as_view()(
+                request, child_pk=self.child.pk, pk=self.nap.pk
+            )
         self.assertEqual(response.status_code, 302)
-        self.nap.refresh_from_db()
-        self.assertEqual(self.nap.napped_at.hour, 15)
+        # Read the saved column directly; the class-level fixture is left as-is
+        napped_at = Nap.objects.values_list("napped_at", flat=True).get(pk=self.nap.pk)
+        self.assertEqual(napped_at.hour, 15)
 
     def test_nap_delete_requires_login(self):
-        response = self.client.get(
-            reverse(
-                URL_NAP_DELETE, kwargs={"child_pk": self.child.pk, "pk": self.nap.pk}
-            )
-        )
+        response = self.client.get(self.url_delete)
         self.assertEqual(response.status_code, 302)
 
     def test_nap_delete_only_own_nap(self):
-        self.client.login(email=TEST_PARENT_EMAIL, password=TEST_PASSWORD)
+        self.client.force_login(self.user)
         other_nap = Nap.objects.create(
             child=self.other_child,
             napped_at=timezone.now(),
@@ -529,67 +657,68 @@ class NapViewTests(TestCase):
         self.assertEqual(response.status_code, 404)
 
     def test_nap_delete_deletes_nap(self):
-        self.client.login(email=TEST_PARENT_EMAIL, password=TEST_PASSWORD)
+        # HTTP stack is covered by test_coparent_can_delete_nap
         nap_pk = self.nap.pk
-        response = self.client.post(
-            reverse(URL_NAP_DELETE, kwargs={"child_pk": self.child.pk, "pk": nap_pk})
-        )
+        request = RequestFactory().post(self.url_delete)
+        request.user = self.user
+        response = NapDeleteView.as_view()(request, child_pk=self.child.pk, pk=nap_pk)
         self.assertEqual(response.status_code, 302)
         self.assertFalse(Nap.objects.filter(pk=nap_pk).exists())
 
     def test_nap_edit_get_shows_context(self):
-        self.client.login(email=TEST_PARENT_EMAIL, password=TEST_PASSWORD)
-        response = self.client.get(
-            reverse(URL_NAP_EDIT, kwargs={"child_pk": self.child.pk, "pk": self.nap.pk})
-        )
+        self.client.force_login(self.user)
+        response = self.client.get(self.url_edit)
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.context["child"], self.child)
 
     def test_coparent_can_edit_nap(self):
-        coparent = get_user_model().objects.create_user(
-            username="coparent",
-            email="coparent@example.com",
-            password=TEST_PASSWORD,
-        )
-        ChildShare.objects.create(
-            child=self.child,
-            user=coparent,
-            role=ChildShare.Role.CO_PARENT,
-            created_by=self.user,
-        )
-        self.client.login(email="coparent@example.com", password=TEST_PASSWORD)
+        self.client.force_login(self.coparent)
         response = self.client.post(
-            reverse(
-                URL_NAP_EDIT, kwargs={"child_pk": self.child.pk, "pk": self.nap.pk}
-            ),
+            self.url_edit,
             {"napped_at": "2024-02-01T16:00"},
         )
         self.assertRedirects(
             response,
-            reverse(URL_NAP_LIST, kwargs={"child_pk": self.child.pk}),
-        )
+            self.url_list,
+        )
+
+    def test_edit_queryset_checks_coparent_without_join_or_distinct(self):
+        """Co-parent access is an EXISTS subquery, so rows never need DISTINCT."""
+        request = RequestFactory().get(self.url_edit)
+        request.user = self.coparent
+        view = NapUpdateView()
+        view.setup(request, child_pk=self.child.pk, pk=self.nap.pk)
+        sql = str(view.get_queryset().query)
+        self.assertIn("EXISTS", sql)
+        self.assertNotIn("DISTINCT", sql)
+        self.assertEqual(list(view.get_queryset()), [self.nap])
+
+    def test_coparent_edit_access_check_reads_share_once(self):
+        """Access and edit permission reuse one role lookup."""
+        request = RequestFactory().get(self.url_edit)
+        request.user = self.coparent
+        with CaptureQueriesContext(connection) as ctx:
+            response = NapUpdateView.as_view()(
+                request, child_pk=self.child.pk, pk=self.nap.pk
+            )
+        self.assertEqual(response.status_code, 200)
+        share_lookups = [
+            q
+            for q in ctx.captured_queries
+            if q["sql"].startswith('SELECT "children_childshare"')
+        ]
+        self.assertEqual(len(share_lookups), 1)
 
     def test_coparent_can_delete_nap(self):
-        coparent = get_user_model().objects.create_user(
-            username="coparent2",
-            email="coparent2@example.com",
-            password=TEST_PASSWORD,
-        )
-        ChildShare.objects.create(
-            child=self.child,
-            user=coparent,
-            role=ChildShare.Role.CO_PARENT,
-            created_by=self.user,
-        )
         nap = Nap.objects.create(
             child=self.child,
             napped_at=timezone.now(),
         )
-        self.client.login(email="coparent2@example.com", password=TEST_PASSWORD)
+        self.client.force_login(self.coparent)
         response = self.client.post(
             reverse(URL_NAP_DELETE, kwargs={"child_pk": self.child.pk, "pk": nap.pk})
         )
         self.assertRedirects(
             response,
-            reverse(URL_NAP_LIST, kwargs={"child_pk": self.child.pk}),
+            self.url_list,
         )
@@ -2,11 +2,15 @@
 
 from datetime import datetime
 
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from rest_framework import status
 
 from children.tests_tracking_base import BaseTrackingAPITests
 
+from .api import NestedNapSerializer
 from .models import Nap
 
 # Test data constants for API calls (ISO format strings)
@@ -17,13 +21,14 @@ TEST_ENDED_AT_STR = "2025-01-15T14:30:00Z"
 
 # Test data constants for model creation (timezone-aware datetimes)
 TEST_NAPPED_AT = timezone.make_aware(datetime(2025, 1, 15, 13, 0, 0))
-TEST_NAPPED_AT_ALT = timezone.make_aware(datetime(2025, 1, 15, 14, 0, 0))
 TEST_ENDED_AT = timezone.make_aware(datetime(2025, 1, 15, 14, 30, 0))
 
 
 class NapAPITests(BaseTrackingAPITests):
     """Tests for Nap API endpoints."""
 
+    __test__ = True
+
     model = Nap
     app_name = "naps"
 
@@ -41,25 +46,19 @@ class NapAPITests(BaseTrackingAPITests):
     # Naps-specific tests
     def test_list_naps(self):
         """Can list naps."""
-        Nap.objects.create(
-            child=self.child,
-            napped_at=TEST_NAPPED_AT,
-        )
-        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.owner_token.key}")
+        self.create_test_record()
         response = self.client.get(self.get_list_url())
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data["results"]), 1)
 
     def test_create_nap(self):
         """Owner can create nap."""
-        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.owner_token.key}")
         response = self.client.post(self.get_list_url(), self.get_create_data())
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
     def test_owner_can_update(self):
         """Owner can update naps."""
         nap = self.create_test_record()
-        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.owner_token.key}")
         response = self.client.put(
             self.get_detail_url(nap.pk),
             {"napped_at": TEST_NAPPED_AT_ALT_STR},
@@ -68,7 +67,6 @@ class NapAPITests(BaseTrackingAPITests):
 
     def test_create_nap_with_ended_at(self):
         """Can create nap with ended_at."""
-        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.owner_token.key}")
         response = self.client.post(
             self.get_list_url(),
             {
@@ -82,7 +80,6 @@ class NapAPITests(BaseTrackingAPITests):
 
     def test_create_nap_without_ended_at(self):
         """Can create nap without ended_at (ongoing nap)."""
-        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.owner_token.key}")
         response = self.client.post(
             self.get_list_url(),
             {"napped_at": TEST_NAPPED_AT_STR},
@@ -93,7 +90,6 @@ class NapAPITests(BaseTrackingAPITests):
 
     def test_ended_at_before_napped_at_rejected(self):
         """Ended_at before napped_at is rejected."""
-        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.owner_token.key}")
         response = self.client.post(
             self.get_list_url(),
             {
@@ -105,28 +101,78 @@ class NapAPITests(BaseTrackingAPITests):
 
     def test_list_includes_ended_at_and_duration(self):
         """List response includes ended_at and duration_minutes."""
-        Nap.objects.create(
-            child=self.child,
-            napped_at=TEST_NAPPED_AT,
-            ended_at=TEST_ENDED_AT,
+        Nap.objects.bulk_create(
+            [
+                Nap(child=self.child, napped_at=TEST_NAPPED_AT, ended_at=TEST_ENDED_AT)
+                for _ in range(5)
+            ]
         )
-        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.owner_token.key}")
-        response = self.client.get(self.get_list_url())
+        cache.clear()  # Cold access-ID cache so the count is deterministic
+        # token, accessible child IDs, COUNT, page - independent of row count
+        with self.assertNumQueries(4):
+            response = self.client.get(self.get_list_url())
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         nap_data = response.data["results"][0]
         self.assertIn("ended_at", nap_data)
         self.assertIn("duration_minutes", nap_data)
         self.assertAlmostEqual(nap_data["duration_minutes"], 90.0)
 
+    def test_list_sparse_fieldset(self):
+        """?fields= limits both the response keys and the selected columns."""
+        Nap.objects.create(
+            child=self.child,
+            napped_at=TEST_NAPPED_AT,
+            ended_at=TEST_ENDED_AT,
+        )
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(
+                self.get_list_url(), {"fields": "id,napped_at,bogus"}
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data["results"][0]), {"id", "napped_at"})
+        select_sql = next(
+            q["sql"]
+            for q in ctx.captured_queries
+            if '"children_nap"."napped_at"' in q["sql"]
+        )
+        self.assertNotIn('"children_nap"."created_at"', select_sql)
+        self.assertNotIn('"children_nap"."updated_at"', select_sql)
+
+    def test_list_unknown_fields_returns_all_fields(self):
+        """A fields param with no known names falls back to the full payload."""
+        self.create_test_record()
+        response = self.client.get(self.get_list_url(), {"fields": "bogus"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("created_at", response.data["results"][0])
+
+    def test_serializer_caches_readable_fields(self):
+        """Readable fields are computed once and reused for every row."""
+        naps = [self.create_test_record() for _ in range(3)]
+        serializer = NestedNapSerializer(naps, many=True)
+        data = serializer.data
+        self.assertEqual(len(data), 3)
+        readable = serializer.child._readable_fields
+        self.assertIsInstance(readable, list)
+        self.assertIs(serializer.child._readable_fields, readable)
+        self.assertEqual(
+            [f.field_name for f in readable],
+            [
+                "id",
+                "napped_at",
+                "ended_at",
+                "duration_minutes",
+                "created_at",
+                "updated_at",
+            ],
+        )
+
     def test_pagination_applied(self):
         """Verify pagination is applied to list endpoints (PAGE_SIZE=20)."""
-        for _ in range(30):
-            Nap.objects.create(
-                child=self.child,
-                napped_at=TEST_NAPPED_AT,
-            )
+        # bulk_create skips the auto-end signal, which pagination doesn't need
+        Nap.objects.bulk_create(
+            [Nap(child=self.child, napped_at=TEST_NAPPED_AT) for _ in range(30)]
+        )
 
-        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.owner_token.key}")
         response = self.client.get(self.get_list_url())
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -139,7 +185,9 @@ class NapAPITests(BaseTrackingAPITests):
         self.assertIsNotNone(response.data["next"])
         self.assertIsNone(response.data["previous"])
 
-        response_page2 = self.client.get(response.data["next"])
+        # Access IDs are cached by the first request: token, COUNT, page
+        with self.assertNumQueries(3):
+            response_page2 = self.client.get(response.data["next"])
         self.assertEqual(len(response_page2.data["results"]), 10)
         self.assertIsNone(response_page2.data["next"])
         self.assertIsNotNone(response_page2.data["previous"])
@@ -1,8 +1,10 @@
 """Tests for nap auto-end signals."""
 
 from datetime import date, timedelta
+from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
 from django.test import TestCase
 from django.utils import timezone
 
@@ -14,6 +16,11 @@ from feedings.models import Feeding
 from .models import Nap
 
 
+def _saved_ended_at(nap):
+    """Read only the stored ended_at for a nap."""
+    return Nap.objects.values_list("ended_at", flat=True).get(pk=nap.pk)
+
+
 class NapAutoEndSignalTests(TestCase):
     @classmethod
     def setUpTestData(cls):
@@ -45,8 +52,7 @@ class NapAutoEndSignalTests(TestCase):
             amount_oz=4.0,
         )
 
-        nap.refresh_from_db()
-        self.assertEqual(nap.ended_at, feeding_time)
+        self.assertEqual(_saved_ended_at(nap), feeding_time)
 
     def test_diaper_ends_open_nap(self):
         nap_start = timezone.now() - timedelta(hours=2)
@@ -59,8 +65,7 @@ class NapAutoEndSignalTests(TestCase):
             change_type="wet",
         )
 
-        nap.refresh_from_db()
-        self.assertEqual(nap.ended_at, diaper_time)
+        self.assertEqual(_saved_ended_at(nap), diaper_time)
 
     def test_new_nap_ends_old_open_nap(self):
         old_nap_start = timezone.now() - timedelta(hours=3)
@@ -69,11 +74,9 @@ class NapAutoEndSignalTests(TestCase):
         new_nap_start = timezone.now() - timedelta(hours=1)
         new_nap = Nap.objects.create(child=self.child, napped_at=new_nap_start)
 
-        old_nap.refresh_from_db()
-        self.assertEqual(old_nap.ended_at, new_nap_start)
+        self.assertEqual(_saved_ended_at(old_nap), new_nap_start)
 
-        new_nap.refresh_from_db()
-        self.assertIsNone(new_nap.ended_at)
+        self.assertIsNone(_saved_ended_at(new_nap))
 
     def test_does_not_end_nap_for_different_child(self):
         nap_start = timezone.now() - timedelta(hours=2)
@@ -87,8 +90,7 @@ class NapAutoEndSignalTests(TestCase):
             amount_oz=4.0,
         )
 
-        nap.refresh_from_db()
-        self.assertIsNone(nap.ended_at)
+        self.assertIsNone(_saved_ended_at(nap))
 
     def test_does_not_end_already_ended_nap(self):
         nap_start = timezone.now() - timedelta(hours=3)
@@ -107,8 +109,7 @@ class NapAutoEndSignalTests(TestCase):
             amount_oz=4.0,
         )
 
-        nap.refresh_from_db()
-        self.assertEqual(nap.ended_at, original_end)
+        self.assertEqual(_saved_ended_at(nap), original_end)
 
     def test_does_not_end_nap_started_after_activity(self):
         """A nap that started after the activity timestamp should not be ended."""
@@ -124,8 +125,7 @@ class NapAutoEndSignalTests(TestCase):
             amount_oz=4.0,
         )
 
-        nap.refresh_from_db()
-        self.assertIsNone(nap.ended_at)
+        self.assertIsNone(_saved_ended_at(nap))
 
     def test_update_does_not_trigger_auto_end(self):
         """Updating an existing feeding should not end open naps."""
@@ -141,12 +141,119 @@ class NapAutoEndSignalTests(TestCase):
         )
 
         # The nap started after the feeding, so it shouldn't be ended
-        nap.refresh_from_db()
-        self.assertIsNone(nap.ended_at)
+        self.assertIsNone(_saved_ended_at(nap))
 
         # Update the feeding (should not trigger auto-end since created=False)
         feeding.amount_oz = 6.0
         feeding.save()
 
-        nap.refresh_from_db()
-        self.assertIsNone(nap.ended_at)
+        self.assertIsNone(_saved_ended_at(nap))
+
+    def test_raw_save_does_not_end_naps(self):
+        """Fixture loading (raw saves) leaves nap end times as loaded."""
+        nap_start = timezone.now() - timedelta(hours=2)
+        nap = Nap.objects.create(child=self.child, napped_at=nap_start)
+
+        now = timezone.now()
+        # Raw saves skip auto_now, so fixture rows carry their own timestamps
+        feeding = Feeding(
+            child=self.child,
+            fed_at=now - timedelta(hours=1),
+            feeding_type="bottle",
+            amount_oz=4.0,
+            created_at=now,
+            updated_at=now,
+        )
+        feeding.save_base(raw=True)
+
+        self.assertIsNone(_saved_ended_at(nap))
+
+    def test_activities_in_one_transaction_follow_creation_order(self):
+        """Records created in one transaction end naps as separate saves would."""
+        now = timezone.now()
+        first_nap = Nap.objects.create(
+            child=self.child, napped_at=now - timedelta(hours=5)
+        )
+        second_start = now - timedelta(hours=3)
+
+        with transaction.atomic():
+            second_nap = Nap.objects.create(child=self.child, napped_at=second_start)
+            # Saved after the second nap, so it ends that nap, not the first
+            Feeding.objects.create(
+                child=self.child,
+                fed_at=now - timedelta(hours=4),
+                feeding_type="bottle",
+                amount_oz=4.0,
+            )
+
+        self.assertEqual(_saved_ended_at(first_nap), second_start)
+        self.assertIsNone(_saved_ended_at(second_nap))
+
+    def test_backfilled_nap_after_activity_stays_open(self):
+        """A nap saved after a later activity is not ended by that activity."""
+        now = timezone.now()
+        with transaction.atomic():
+            Feeding.objects.create(
+                child=self.child,
+                fed_at=now - timedelta(hours=1),
+                feeding_type="bottle",
+                amount_oz=4.0,
+            )
+            nap = Nap.objects.create(
+                child=self.child, napped_at=now - timedelta(hours=2)
+            )
+
+        self.assertIsNone(_saved_ended_at(nap))
+
+    def test_rolled_back_savepoint_does_not_end_naps(self):
+        """Naps ended inside a rolled-back savepoint are reopened with it."""
+        now = timezone.now()
+        nap = Nap.objects.create(child=self.child, napped_at=now - timedelta(hours=3))
+
+        with transaction.atomic():
+            try:
+                with transaction.atomic():
+                    Feeding.objects.create(
+                        child=self.child,
+                        fed_at=now - timedelta(hours=2),
+                        feeding_type="bottle",
+                        amount_oz=4.0,
+                    )
+                    raise IntegrityError
+            except IntegrityError:
+                pass
+            diaper_time = now - timedelta(hours=1)
+            DiaperChange.objects.create(
+                child=self.child,
+                changed_at=diaper_time,
+                change_type="wet",
+            )
+
+        self.assertEqual(_saved_ended_at(nap), diaper_time)
+
+    def test_auto_end_bumps_updated_at(self):
+        """Auto-ending a nap moves its updated_at forward."""
+        nap_start = timezone.now() - timedelta(hours=2)
+        nap = Nap.objects.create(child=self.child, napped_at=nap_start)
+        backdated = nap_start - timedelta(days=1)
+        Nap.objects.filter(pk=nap.pk).update(updated_at=backdated)
+
+        Feeding.objects.create(
+            child=self.child,
+            fed_at=nap_start + timedelta(hours=1),
+            feeding_type="bottle",
+            amount_oz=4.0,
+        )
+
+        updated_at = Nap.objects.values_list("updated_at", flat=True).get(pk=nap.pk)
+        self.assertGreater(updated_at, backdated)
+
+    def test_end_open_before_uses_database_clock(self):
+        """updated_at comes from Now() in SQL, not timezone.now()."""
+        nap_start = timezone.now() - timedelta(hours=2)
+        Nap.objects.create(child=self.child, napped_at=nap_start)
+
+        with patch("django.utils.timezone.now") as mock_now:
+            ended = Nap.end_open_before(self.child.id, nap_start + timedelta(hours=1))
+        mock_now.assert_not_called()
+        self.assertEqual(ended, 1)
@@ -3,6 +3,9 @@
 from django.core.cache import cache
 
 UNREAD_COUNT_CACHE_TTL = 300  # 5 minutes (invalidated on notification create/read)
+PREFERENCE_CACHE_TTL = 3600  # 1 hour (invalidated on preference save/delete)
+
+PREFERENCE_FIELDS = ("notify_feedings", "notify_diapers", "notify_naps")
 
 
 def unread_count_cache_key(user_id: int) -> str:
@@ -18,3 +21,44 @@ def invalidate_unread_count_cache(user_id: int) -> None:
     return fresh counts.
     """
     cache.delete(unread_count_cache_key(user_id))
+
+
+def preference_cache_key(user_id: int, child_id: int) -> str:
+    """Return cache key for a user's notification preferences on a child."""
+    return f"notification_prefs_{user_id}_{child_id}"
+
+
+def get_preferences(user_ids, child_id: int) -> dict[int, dict[str, bool]]:
+    """Return {user_id: {preference field: bool}} for users on one child.
+
+    Cached per (user, child); misses are filled with one query and written
+    back with set_many. Users without a preference row map to an empty dict
+    (cached too), meaning every event type is enabled.
+    """
+    from .models import NotificationPreference
+
+    keys = {preference_cache_key(user_id, child_id): user_id for user_id in user_ids}
+    cached = cache.get_many(keys)
+    prefs = {keys[key]: value for key, value in cached.items()}
+
+    missing = [user_id for key, user_id in keys.items() if key not in cached]
+    if missing:
+        fetched: dict[int, dict[str, bool]] = {user_id: {} for user_id in missing}
+        for row in NotificationPreference.objects.filter(
+            user_id__in=missing, child_id=child_id
+        ).values("user_id", *PREFERENCE_FIELDS):
+            fetched[row.pop("user_id")] = row
+        cache.set_many(
+            {preference_cache_key(uid, child_id): v for uid, v in fetched.items()},
+            PREFERENCE_CACHE_TTL,
+        )
+        prefs.update(fetched)
+    return prefs
+
+
+def invalidate_preference_cache(user_id: int, child_id: int) -> None:
+    """Invalidate cached notification preferences for a user on a child.
+
+    Call when the preference row is saved or deleted.
+    """
+    cache.delete(preference_cache_key(user_id, child_id))
@@ -0,0 +1,27 @@
+# Generated by Django 6.0 on 2026-10-17 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        (
+            "notifications",
+            "0004_change_device_token_to_charfield_and_pattern_alert_choices",
+        ),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="notification",
+            name="notif_recipient_unread_idx",
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                condition=models.Q(("is_read", False)),
+                fields=["recipient", "-created_at"],
+                name="notif_recip_unread_partial",
+            ),
+        ),
+    ]
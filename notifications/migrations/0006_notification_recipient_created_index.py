@@ -0,0 +1,19 @@
+# Generated by Django 6.0 on 2026-10-17 14:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notifications", "0005_notification_unread_partial_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                fields=["recipient", "-created_at"],
+                name="notif_recip_created_idx",
+            ),
+        ),
+    ]
@@ -5,6 +5,7 @@ tracking activities (feedings, diapers, naps) for shared children.
 Includes per-child notification preferences and global quiet hours.
 """
 
+from functools import lru_cache
 from zoneinfo import ZoneInfo
 
 from django.conf import settings
@@ -15,6 +16,12 @@ from django.utils import timezone
 CHILD_MODEL = "children.Child"
 
 
+@lru_cache(maxsize=512)
+def _zoneinfo(name):
+    """Return the ZoneInfo for name, memoized across quiet-hours checks."""
+    return ZoneInfo(name)
+
+
 class Notification(models.Model):
     """In-app notification for shared activity alerts."""
 
@@ -53,9 +60,16 @@ class Notification(models.Model):
     class Meta:
         ordering = ["-created_at"]
         indexes = [
+            # Notification list: a user's notifications, newest first
             models.Index(
-                fields=["recipient", "is_read", "-created_at"],
-                name="notif_recipient_unread_idx",
+                fields=["recipient", "-created_at"],
+                name="notif_recip_created_idx",
+            ),
+            # Partial: only unread rows, which stay a small share of the table
+            models.Index(
+                fields=["recipient", "-created_at"],
+                name="notif_recip_unread_partial",
+                condition=models.Q(is_read=False),
             ),
             models.Index(
                 fields=["created_at"],
@@ -124,17 +138,21 @@ class QuietHours(models.Model):
         status = "ON" if self.enabled else "OFF"
         return f"Quiet hours for {self.user.email}: {self.start_time}-{self.end_time} ({status})"
 
-    def is_quiet_now(self):
+    def is_quiet_now(self, now=None):
         """Check if current time falls within quiet hours for this user.
 
         Uses the user's configured timezone from CustomUser.timezone.
         Handles overnight ranges (e.g., 22:00 to 07:00).
+
+        Args:
+            now: Aware datetime to check instead of timezone.now(), so callers
+                checking many users can read the clock once.
         """
         if not self.enabled:
             return False
 
-        user_tz = ZoneInfo(self.user.timezone)
-        now_local = timezone.now().astimezone(user_tz).time()
+        user_tz = _zoneinfo(self.user.timezone)
+        now_local = (now or timezone.now()).astimezone(user_tz).time()
 
         if self.start_time <= self.end_time:
             # Same-day range (e.g., 09:00 to 17:00)
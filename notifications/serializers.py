@@ -1,15 +1,23 @@
 """Serializers for the notifications API."""
 
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce, NullIf, StrIndex, Substr
 from rest_framework import serializers
 
+from django_project.serializers import SerializerCacheMixin
+
 from .models import DeviceToken, Notification, NotificationPreference, QuietHours
 
 
-class NotificationSerializer(serializers.ModelSerializer):
-    """Serializer for notification list/detail responses."""
+class NotificationSerializer(SerializerCacheMixin, serializers.ModelSerializer):
+    """Serializer for notification list/detail responses.
 
-    actor_name = serializers.SerializerMethodField()
-    child_name = serializers.CharField(source="child.name", read_only=True)
+    ``actor_name`` and ``child_name`` are computed in SQL, so querysets must
+    be passed through ``setup_eager_loading()`` first.
+    """
+
+    actor_name = serializers.CharField(read_only=True)
+    child_name = serializers.CharField(read_only=True)
 
     class Meta:
         model = Notification
@@ -25,10 +33,42 @@ class NotificationSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = fields
 
-    def get_actor_name(self, obj):
-        if obj.actor is None:
-            return "System"
-        return obj.actor.first_name or obj.actor.email.split("@")[0]
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Load only the columns this serializer reads, names included.
+
+        The child's name is annotated rather than select_related, so no
+        Child instance is built per row.
+        """
+        return cls.with_actor_name(
+            queryset.only(
+                "id",
+                "event_type",
+                "message",
+                "is_read",
+                "created_at",
+                # recipient_id is read by the unread-count post_save handler
+                "recipient",
+                "child",
+            ).annotate(child_name=F("child__name"))
+        )
+
+    @staticmethod
+    def with_actor_name(queryset):
+        """Annotate actor_name: first name, else email local part, else "System".
+
+        An email without "@" (e.g. blank) yields a NULL length rather than
+        -1, which Postgres rejects in SUBSTRING, so it falls through too.
+        """
+        email = F("actor__email")
+        at = NullIf(StrIndex(email, Value("@")), Value(0))
+        return queryset.annotate(
+            actor_name=Coalesce(
+                NullIf(F("actor__first_name"), Value("")),
+                NullIf(Substr(email, 1, at - 1), Value("")),
+                Value("System"),
+            )
+        )
 
 
 class NotificationPreferenceSerializer(serializers.ModelSerializer):
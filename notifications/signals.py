@@ -2,14 +2,15 @@
 
 Defines a custom `tracking_created` signal dispatched from TrackingViewSet
 and BatchCreateView after saving tracking records. Handlers queue Celery
-tasks to create notifications for shared users.
+tasks (after the transaction commits) to create notifications for shared users.
 """
 
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import Signal, receiver
 
-from .cache import invalidate_unread_count_cache
-from .models import Notification
+from .cache import invalidate_preference_cache, invalidate_unread_count_cache
+from .models import Notification, NotificationPreference
 
 tracking_created = Signal()
 
@@ -18,13 +19,20 @@ tracking_created = Signal()
 def queue_notification_on_tracking_create(
     sender, instance, actor_id, event_type, **kwargs
 ):
-    """Queue notification creation when a tracking record is created."""
+    """Queue notification creation once the tracking record is committed.
+
+    Deferring to on_commit keeps the broker round-trip out of the request's
+    transaction and never queues a task for a record that was rolled back.
+    """
     from .tasks import create_notifications_for_activity
 
-    create_notifications_for_activity.delay(
-        child_id=instance.child_id,
-        actor_id=actor_id,
-        event_type=event_type,
+    child_id = instance.child_id
+    transaction.on_commit(
+        lambda: create_notifications_for_activity.delay(
+            child_id=child_id,
+            actor_id=actor_id,
+            event_type=event_type,
+        )
     )
 
 
@@ -32,3 +40,10 @@ def queue_notification_on_tracking_create(
 def invalidate_unread_count_on_notification_change(sender, instance, **kwargs):
     """Invalidate cached unread count when a notification is created or updated."""
     invalidate_unread_count_cache(instance.recipient_id)
+
+
+@receiver(post_save, sender=NotificationPreference)
+@receiver(post_delete, sender=NotificationPreference)
+def invalidate_preference_cache_on_change(sender, instance, **kwargs):
+    """Invalidate cached preferences when a preference row changes or is removed."""
+    invalidate_preference_cache(instance.user_id, instance.child_id)
@@ -1,14 +1,53 @@
 """Celery tasks for notification creation and cleanup."""
 
 import logging
+import operator
 from datetime import timedelta
+from functools import reduce
 
 from celery import shared_task
-from django.db import IntegrityError
+from dateutil.parser import isoparse  # type: ignore[import-untyped]
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef, Prefetch, Q, Subquery
 from django.utils import timezone
 
+from accounts.models import CustomUser
+from children.models import Child, ChildShare
+from feedings.models import Feeding
+from naps.models import Nap
+
+from .cache import get_preferences, invalidate_unread_count_cache
+from .models import (
+    DeviceToken,
+    FeedingReminderLog,
+    Notification,
+    NotificationPreference,
+    PatternAlertLog,
+    QuietHours,
+)
+
 logger = logging.getLogger(__name__)
 
+# Max notifications deleted per cleanup run before it reschedules itself
+CLEANUP_BATCH_SIZE = 5000
+
+# QuietHours.is_quiet_now only reads these, so skip the rest of the user row
+QUIET_HOURS_FIELDS = ("user", "enabled", "start_time", "end_time", "user__timezone")
+
+# Activity event type -> NotificationPreference field that gates it
+EVENT_PREF_FIELDS = {
+    "feeding": "notify_feedings",
+    "diaper": "notify_diapers",
+    "nap": "notify_naps",
+}
+
+# Activity event type -> phrase used in the notification message
+EVENT_LABELS = {
+    "feeding": "a feeding",
+    "diaper": "a diaper change",
+    "nap": "a nap",
+}
+
 
 @shared_task(bind=True, time_limit=60)
 def create_notifications_for_activity(self, child_id, actor_id, event_type):
@@ -17,95 +56,64 @@ def create_notifications_for_activity(self, child_id, actor_id, event_type):
     Excludes the actor (person who logged the activity).
     Respects per-child notification preferences and quiet hours.
     """
-    from accounts.models import CustomUser
-    from children.models import Child, ChildShare
-
-    from .models import Notification, NotificationPreference, QuietHours
+    pref_field = EVENT_PREF_FIELDS.get(event_type)
+    if not pref_field:
+        return f"Unknown event type: {event_type}"
 
     try:
-        child = Child.objects.select_related("parent").get(id=child_id)
+        # Only parent_id and name are read, so skip the parent JOIN
+        child = Child.objects.only("id", "name", "parent_id").get(id=child_id)
     except Child.DoesNotExist:
         return "Child not found"
 
-    try:
-        actor = CustomUser.objects.get(id=actor_id)
-    except CustomUser.DoesNotExist:
+    # Only the name fields are needed for the message
+    actor = CustomUser.objects.filter(id=actor_id).values("first_name", "email").first()
+    if actor is None:
         return "Actor not found"
 
     # Build recipient set: owner + all shared users, minus actor
-    recipient_ids = set()
-    recipient_ids.add(child.parent_id)
-    shared_user_ids = ChildShare.objects.filter(child=child).values_list(
-        "user_id", flat=True
-    )
-    recipient_ids.update(shared_user_ids)
+    recipient_ids = Child.member_ids(child_id)
     recipient_ids.discard(actor_id)
 
     if not recipient_ids:
         return "No recipients"
 
-    # Map event_type to preference field
-    pref_field_map = {
-        "feeding": "notify_feedings",
-        "diaper": "notify_diapers",
-        "nap": "notify_naps",
-    }
-    pref_field = pref_field_map.get(event_type)
-    if not pref_field:
-        return f"Unknown event type: {event_type}"
-
-    # Fetch preferences for all recipients at once
-    prefs = {
-        p.user_id: p
-        for p in NotificationPreference.objects.filter(
-            user_id__in=recipient_ids, child=child
-        )
+    # Drop recipients who opted out for this child (no pref row = enabled)
+    prefs = get_preferences(recipient_ids, child_id)
+    eligible_ids = {
+        user_id for user_id in recipient_ids if prefs[user_id].get(pref_field, True)
     }
+    if not eligible_ids:
+        return "No eligible recipients"
 
-    # Fetch quiet hours for all recipients at once
-    quiet_hours = {
-        qh.user_id: qh
-        for qh in QuietHours.objects.select_related("user").filter(
-            user_id__in=recipient_ids, enabled=True
-        )
+    # Drop recipients in quiet hours, checked against one clock read
+    now = timezone.now()
+    eligible_ids -= {
+        qh.user_id
+        for qh in QuietHours.objects.select_related("user")
+        .only(*QUIET_HOURS_FIELDS)
+        .filter(user_id__in=eligible_ids, enabled=True)
+        if qh.is_quiet_now(now)
     }
 
     # Build message
-    event_labels = {
-        "feeding": "a feeding",
-        "diaper": "a diaper change",
-        "nap": "a nap",
-    }
-    actor_name = actor.first_name or actor.email.split("@")[0]
-    message = f"{actor_name} logged {event_labels[event_type]} for {child.name}"
-
-    notifications = []
-    for recipient_id in recipient_ids:
-        # Check per-child preference (default: enabled if no pref row)
-        pref = prefs.get(recipient_id)
-        if pref and not getattr(pref, pref_field):
-            continue
-
-        # Check quiet hours
-        qh = quiet_hours.get(recipient_id)
-        if qh and qh.is_quiet_now():
-            continue
+    actor_name = actor["first_name"] or actor["email"].split("@")[0]
+    message = f"{actor_name} logged {EVENT_LABELS[event_type]} for {child.name}"
 
-        notifications.append(
-            Notification(
-                recipient_id=recipient_id,
-                actor=actor,
-                child=child,
-                event_type=event_type,
-                message=message,
-            )
+    notifications = [
+        Notification(
+            recipient_id=recipient_id,
+            actor_id=actor_id,
+            child=child,
+            event_type=event_type,
+            message=message,
         )
+        for recipient_id in eligible_ids
+    ]
 
     if notifications:
         Notification.objects.bulk_create(notifications)
         # bulk_create does not fire post_save; invalidate unread count cache per recipient
-        from .cache import invalidate_unread_count_cache
-
         for recipient_id in {n.recipient_id for n in notifications}:
             invalidate_unread_count_cache(recipient_id)
 
@@ -127,12 +135,24 @@ def create_notifications_for_activity(self, child_id, actor_id, event_type):
 
 
 @shared_task(bind=True, time_limit=120)
-def cleanup_old_notifications(self):
-    """Delete notifications older than 30 days. Runs daily via Celery Beat."""
-    from .models import DeviceToken, FeedingReminderLog, Notification, PatternAlertLog
+def cleanup_old_notifications(self, batch_size=CLEANUP_BATCH_SIZE):
+    """Delete notifications older than 30 days. Runs daily via Celery Beat.
 
+    Notifications are deleted at most ``batch_size`` rows per run so a large
+    backlog never holds long locks or runs into the time limit; a full batch
+    reschedules the task to continue with the next one.
+    """
     cutoff = timezone.now() - timedelta(days=30)
-    deleted_count, _ = Notification.objects.filter(created_at__lt=cutoff).delete()
+    batch_ids = list(
+        Notification.objects.filter(created_at__lt=cutoff)
+        .order_by("id")
+        .values_list("id", flat=True)[:batch_size]
+    )
+    deleted_count = 0
+    if batch_ids:
+        deleted_count, _ = Notification.objects.filter(id__in=batch_ids).delete()
+    if len(batch_ids) == batch_size:
+        self.apply_async(kwargs={"batch_size": batch_size}, countdown=1)
 
     # Also cleanup old FeedingReminderLog entries
     log_cutoff = timezone.now() - timedelta(days=7)
@@ -156,29 +176,61 @@ def cleanup_old_notifications(self):
     )
 
 
-def _get_last_fed_at(child):
-    """Return the fed_at of the last feeding for the child, or None."""
-    from feedings.models import Feeding
+def _get_prefs_by_child(child_ids):
+    """Return {child_id: {user_id: NotificationPreference}} in one query."""
+    prefs_by_child = {}
+    for pref in NotificationPreference.objects.filter(child_id__in=child_ids).only(
+        "user_id", "child_id", "notify_feedings"
+    ):
+        prefs_by_child.setdefault(pref.child_id, {})[pref.user_id] = pref
+    return prefs_by_child
+
+
+def _overdue_for_reminder(now):
+    """Q for children whose last feeding is at least their reminder interval ago.
+
+    One branch per interval choice keeps the comparison a plain datetime
+    bound instead of integer-to-interval arithmetic in SQL. Expects the
+    queryset to annotate ``last_fed_at``; children never fed don't match.
+    """
+    choices = Child._meta.get_field("feeding_reminder_interval").choices
+    return reduce(
+        operator.or_,
+        (
+            Q(
+                feeding_reminder_interval=hours,
+                last_fed_at__lte=now - timedelta(hours=hours),
+            )
+            for hours, _ in choices
+        ),
+    )
+
+
+def _reminder_logged(reminder_number):
+    """Exists() for a log of ``reminder_number`` in the outer child's window.
 
-    last = (
-        Feeding.objects.filter(child=child).order_by("-fed_at").values("fed_at").first()
+    Expects the outer queryset to annotate ``last_fed_at``.
+    """
+    return Exists(
+        FeedingReminderLog.objects.filter(
+            child_id=OuterRef("pk"),
+            window_start=OuterRef("last_fed_at"),
+            reminder_number=reminder_number,
+        )
     )
-    return last["fed_at"] if last else None
 
 
 def _get_reminder_recipient_ids(child):
-    """Return set of user ids who should receive reminders (owner + shared users)."""
-    from children.models import ChildShare
+    """Return set of user ids who should receive reminders (owner + shared users).
 
-    ids = {child.parent_id}
-    ids.update(ChildShare.objects.filter(child=child).values_list("user_id", flat=True))
-    return ids
+    Reads ``child.shares`` so the task's prefetch is reused instead of
+    querying ChildShare once per child.
+    """
+    return {child.parent_id, *(share.user_id for share in child.shares.all())}
 
 
 def _build_reminder_notifications(child, recipient_ids, prefs, message):
     """Build list of Notification instances for recipients who have notify_feedings."""
-    from .models import Notification
-
     notifications = []
     for recipient_id in recipient_ids:
         pref = prefs.get(recipient_id)
@@ -196,21 +248,7 @@ def _build_reminder_notifications(child, recipient_ids, prefs, message):
     return notifications
 
 
-def _log_reminder_sent(child, last_fed_at, reminder_number):
-    """Record reminder in FeedingReminderLog for idempotency. Ignores IntegrityError."""
-    from .models import FeedingReminderLog
-
-    try:
-        FeedingReminderLog.objects.create(
-            child=child,
-            window_start=last_fed_at,
-            reminder_number=reminder_number,
-        )
-    except IntegrityError:
-        pass
-
-
-def _maybe_send_reminder_batch(
+def _queue_reminder_batch(
     child,
     last_fed_at,
     recipient_ids,
@@ -218,68 +256,95 @@ def _maybe_send_reminder_batch(
     interval_hours,
     reminder_number,
     time_since_feeding,
-    message,
+    already_sent,
+    pending,
+    logs,
 ):
-    """Send one batch (initial or repeat) if thresholds and idempotency allow. Returns count sent."""
-    from .models import FeedingReminderLog, Notification
+    """Queue one batch (initial or repeat) if thresholds and idempotency allow.
+
+    ``already_sent`` is True when this reminder is already logged for the
+    window. Notifications are appended to ``pending`` and the idempotency
+    record to ``logs``. Returns the number of notifications queued.
 
+    The message is formatted only once a batch is due, and then shared by
+    every recipient's notification.
+    """
     if reminder_number == 1:
         threshold = timedelta(hours=interval_hours)
     else:
         threshold = timedelta(hours=interval_hours * 1.5)
     if time_since_feeding < threshold:
         return 0
-    if FeedingReminderLog.objects.filter(
-        child=child, window_start=last_fed_at, reminder_number=reminder_number
-    ).exists():
+    if already_sent:
         return 0
+    if reminder_number == 1:
+        message = f"Baby hasn't been fed for {interval_hours} hours"
+    else:
+        hours_since = int(time_since_feeding.total_seconds() / 3600)
+        message = f"Baby still hasn't been fed (now {hours_since} hours)"
     notifications = _build_reminder_notifications(child, recipient_ids, prefs, message)
-    if notifications:
-        Notification.objects.bulk_create(notifications)
-        # Invalidate unread count cache (bulk_create skips post_save signals)
-        from .cache import invalidate_unread_count_cache
+    pending.extend(notifications)
+    logs.append(
+        FeedingReminderLog(
+            child=child, window_start=last_fed_at, reminder_number=reminder_number
+        )
+    )
+    return len(notifications)
 
-        for recipient_id in {n.recipient_id for n in notifications}:
-            invalidate_unread_count_cache(recipient_id)
 
-        # Send push notifications for feeding reminders
-        from .fcm import send_push_to_user
+def _send_reminder_notifications(notifications, logs):
+    """Insert all queued reminders and their logs at once, then push them.
 
-        for n in notifications:
-            try:
-                send_push_to_user(
-                    n.recipient_id,
-                    title=f"{child.name} — Feeding Reminder",
-                    body=message,
-                    data={
-                        "event_type": "feeding_reminder",
-                        "child_id": str(child.id),
-                    },
-                )
-            except Exception:
-                logger.exception("Failed to send push for feeding reminder")
-    _log_reminder_sent(child, last_fed_at, reminder_number)
-    return len(notifications)
+    Logs use ``ignore_conflicts`` so a window already logged by a concurrent
+    run is skipped by the database instead of raising IntegrityError.
+    """
+    from .fcm import send_push_to_user
+
+    if not logs:
+        return
+    with transaction.atomic():
+        Notification.objects.bulk_create(notifications, batch_size=500)
+        FeedingReminderLog.objects.bulk_create(
+            logs, batch_size=500, ignore_conflicts=True
+        )
+    # Invalidate unread count cache (bulk_create skips post_save signals)
+    for recipient_id in {n.recipient_id for n in notifications}:
+        invalidate_unread_count_cache(recipient_id)
+
+    # Send push notifications for feeding reminders
+    for n in notifications:
+        try:
+            send_push_to_user(
+                n.recipient_id,
+                title=f"{n.child.name} — Feeding Reminder",
+                body=n.message,
+                data={
+                    "event_type": "feeding_reminder",
+                    "child_id": str(n.child_id),
+                },
+            )
+        except Exception:
+            logger.exception("Failed to send push for feeding reminder")
 
 
-def _process_child_reminders(child):
-    """Process feeding reminders for one child. Returns number of notifications created."""
-    from .models import NotificationPreference
+def _process_child_reminders(child, prefs, pending, logs):
+    """Queue feeding reminders for one child. Returns number of notifications queued.
 
-    last_fed_at = _get_last_fed_at(child)
+    Args:
+        child: Child with ``shares`` prefetched and ``last_fed_at``,
+            ``reminder_1_sent`` and ``reminder_2_sent`` annotated
+        prefs: {user_id: NotificationPreference} for this child
+        pending: List collecting Notification instances for all children
+        logs: List collecting FeedingReminderLog instances for all children
+    """
+    last_fed_at = child.last_fed_at
     if not last_fed_at:
         return 0
     time_since = timezone.now() - last_fed_at
     recipient_ids = _get_reminder_recipient_ids(child)
-    prefs = {
-        p.user_id: p
-        for p in NotificationPreference.objects.filter(
-            user_id__in=recipient_ids, child=child
-        )
-    }
     interval_hours = child.feeding_reminder_interval
     count = 0
-    count += _maybe_send_reminder_batch(
+    count += _queue_reminder_batch(
         child,
         last_fed_at,
         recipient_ids,
@@ -287,9 +352,11 @@ def _process_child_reminders(child):
         interval_hours,
         1,
         time_since,
-        f"Baby hasn't been fed for {interval_hours} hours",
+        child.reminder_1_sent,
+        pending,
+        logs,
     )
-    count += _maybe_send_reminder_batch(
+    count += _queue_reminder_batch(
         child,
         last_fed_at,
         recipient_ids,
@@ -297,7 +364,9 @@ def _process_child_reminders(child):
         interval_hours,
         2,
         time_since,
-        f"Baby still hasn't been fed (now {int(time_since.total_seconds() / 3600)} hours)",
+        child.reminder_2_sent,
+        pending,
+        logs,
     )
     return count
 
@@ -314,14 +383,31 @@ def check_feeding_reminders(self):
     Uses FeedingReminderLog for idempotency to prevent duplicate sends.
     Respects per-child notify_feedings preference but bypasses quiet hours (safety-critical).
     """
-    from children.models import Child
-
-    children = (
-        Child.objects.filter(feeding_reminder_interval__isnull=False)
-        .select_related("parent")
-        .prefetch_related("shares__user")
+    # Last feeding (read off the (child, fed_at) index) and whether each
+    # reminder is already logged for that window are annotated in the same
+    # query; only children already past their interval are loaded. Only
+    # user_id is needed from shares, so skip the shared users.
+    last_feeding = Feeding.objects.filter(child_id=OuterRef("pk")).order_by("-fed_at")
+
+    children = list(
+        Child.objects.annotate(last_fed_at=Subquery(last_feeding.values("fed_at")[:1]))
+        .filter(_overdue_for_reminder(timezone.now()))
+        .annotate(
+            reminder_1_sent=_reminder_logged(1), reminder_2_sent=_reminder_logged(2)
+        )
+        .prefetch_related(
+            Prefetch("shares", queryset=ChildShare.objects.only("child_id", "user_id"))
+        )
+    )
+    # One preference query for all children, instead of per child
+    prefs_by_child = _get_prefs_by_child([child.id for child in children])
+    # Both reminder types for every child go out in a single bulk insert
+    pending, logs = [], []
+    reminder_count = sum(
+        _process_child_reminders(child, prefs_by_child.get(child.id, {}), pending, logs)
+        for child in children
     )
-    reminder_count = sum(_process_child_reminders(child) for child in children)
+    _send_reminder_notifications(pending, logs)
     return f"Created {reminder_count} feeding reminder notifications"
 
 
@@ -334,27 +420,14 @@ def check_pattern_alerts(self):
     Uses PatternAlertLog for idempotency to prevent duplicate sends.
     Respects quiet hours (unlike feeding reminders, these are not safety-critical).
     """
-    from dateutil.parser import isoparse  # type: ignore[import-untyped]
-
     from analytics.utils import compute_pattern_alerts
-    from children.models import Child, ChildShare
 
-    from .cache import invalidate_unread_count_cache
     from .fcm import send_push_to_user
-    from .models import (
-        Notification,
-        NotificationPreference,
-        PatternAlertLog,
-        QuietHours,
-    )
 
     now = timezone.now()
     recent_cutoff = now - timedelta(hours=48)
 
     # Only process children with recent feeding or nap activity
-    from feedings.models import Feeding
-    from naps.models import Nap
-
     active_child_ids = set(
         Feeding.objects.filter(fed_at__gte=recent_cutoff).values_list(
             "child_id", flat=True
@@ -368,7 +441,10 @@ def check_pattern_alerts(self):
     if not active_child_ids:
         return "No active children to check"
 
-    children = Child.objects.filter(id__in=active_child_ids).select_related("parent")
+    # Only id, name and parent_id are read, so skip the parent JOIN
+    children = Child.objects.filter(id__in=active_child_ids).only(
+        "id", "name", "parent_id"
+    )
 
     # Prefetch shares, preferences, and quiet hours for all relevant users
     all_shares = {}
@@ -386,12 +462,14 @@ def check_pattern_alerts(self):
     all_prefs = {}
     for p in NotificationPreference.objects.filter(
         user_id__in=all_user_ids, child_id__in=active_child_ids
-    ):
+    ).only("user_id", "child_id", "notify_feedings", "notify_naps"):
         all_prefs[(p.user_id, p.child_id)] = p
 
     all_quiet_hours = {}
-    for qh in QuietHours.objects.select_related("user").filter(
-        user_id__in=all_user_ids, enabled=True
+    for qh in (
+        QuietHours.objects.select_related("user")
+        .only(*QUIET_HOURS_FIELDS)
+        .filter(user_id__in=all_user_ids, enabled=True)
     ):
         all_quiet_hours[qh.user_id] = qh
 
@@ -448,7 +526,7 @@ def check_pattern_alerts(self):
                     continue
 
                 qh = all_quiet_hours.get(recipient_id)
-                if qh and qh.is_quiet_now():
+                if qh and qh.is_quiet_now(now):
                     continue
 
                 notifications.append(
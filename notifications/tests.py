@@ -1,22 +1,44 @@
 """Model and signal tests for the notifications app."""
 
-from datetime import date, time
+from collections import Counter
+from datetime import date, datetime, time
 from unittest.mock import patch
+from zoneinfo import ZoneInfo
 
 from django.contrib.auth import get_user_model
-from django.db import IntegrityError
+from django.core.cache import cache
+from django.db import IntegrityError, connection, transaction
 from django.test import Client, RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from children.models import Child, ChildShare
+from diapers.models import DiaperChange
 from django_project.test_constants import TEST_PASSWORD
+from feedings.models import Feeding
 
 from .context_processors import notification_unread_count
 from .models import FeedingReminderLog, Notification, NotificationPreference, QuietHours
+from .serializers import NotificationSerializer
 from .signals import tracking_created
+from .tasks import (
+    _send_reminder_notifications,
+    check_feeding_reminders,
+    cleanup_old_notifications,
+    create_notifications_for_activity,
+)
 
 User = get_user_model()
 
+UTC = ZoneInfo("UTC")
+
+
+def _recipient_counts(child):
+    """Return {recipient_id: notification count} for a child in one query."""
+    return Counter(
+        Notification.objects.filter(child=child).values_list("recipient_id", flat=True)
+    )
+
 
 class NotificationModelTests(TestCase):
     @classmethod
@@ -26,11 +48,18 @@ class NotificationModelTests(TestCase):
             email="owner@example.com",
             password=TEST_PASSWORD,
         )
+        # No first name, so serialized actor names fall back to the email
         cls.coparent = User.objects.create_user(
             username="coparent",
             email="coparent@example.com",
             password=TEST_PASSWORD,
         )
+        cls.named_actor = User.objects.create_user(
+            username="jane",
+            email="jane@example.com",
+            password=TEST_PASSWORD,
+            first_name="Jane",
+        )
         cls.child = Child.objects.create(
             parent=cls.owner, name="Baby Alice", date_of_birth=date(2025, 6, 15)
         )
@@ -77,10 +106,20 @@ class NotificationModelTests(TestCase):
         self.assertEqual(notifications[0].message, "Second")
         self.assertEqual(notifications[1].message, "First")
 
+    def _serialize(self, notif):
+        """Serialize a notification as the API does, in a single query."""
+        with self.assertNumQueries(1):
+            loaded = NotificationSerializer.setup_eager_loading(
+                Notification.objects.filter(pk=notif.pk)
+            ).get()
+            data = NotificationSerializer(loaded).data
+        # Names are annotated; no related Child instance is built
+        self.assertFalse(Notification.child.is_cached(loaded))
+        self.assertEqual(data["child_name"], self.child.name)
+        return data
+
     def test_serializer_handles_null_actor(self):
         """Serializer should return 'System' for notifications with no actor."""
-        from .serializers import NotificationSerializer
-
         notif = Notification.objects.create(
             recipient=self.owner,
             actor=None,
@@ -88,31 +127,23 @@ class NotificationModelTests(TestCase):
             event_type=Notification.EventType.FEEDING_REMINDER,
             message="Baby hasn't been fed for 3 hours",
         )
-        serializer = NotificationSerializer(notif)
-        self.assertEqual(serializer.data["actor_name"], "System")
+        data = self._serialize(notif)
+        self.assertEqual(data["actor_name"], "System")
 
     def test_serializer_returns_actor_first_name(self):
         """Serializer should return actor's first name when available."""
-        from .serializers import NotificationSerializer
-
-        self.coparent.first_name = "Jane"
-        self.coparent.save()
         notif = Notification.objects.create(
             recipient=self.owner,
-            actor=self.coparent,
+            actor=self.named_actor,
             child=self.child,
             event_type=Notification.EventType.FEEDING,
             message="Jane logged a feeding",
         )
-        serializer = NotificationSerializer(notif)
-        self.assertEqual(serializer.data["actor_name"], "Jane")
+        data = self._serialize(notif)
+        self.assertEqual(data["actor_name"], "Jane")
 
     def test_serializer_falls_back_to_email(self):
         """Serializer should use email prefix when first_name is empty."""
-        from .serializers import NotificationSerializer
-
-        self.coparent.first_name = ""
-        self.coparent.save()
         notif = Notification.objects.create(
             recipient=self.owner,
             actor=self.coparent,
@@ -120,8 +151,23 @@ class NotificationModelTests(TestCase):
             event_type=Notification.EventType.FEEDING,
             message="Someone logged a feeding",
         )
-        serializer = NotificationSerializer(notif)
-        self.assertEqual(serializer.data["actor_name"], "coparent")
+        data = self._serialize(notif)
+        self.assertEqual(data["actor_name"], "coparent")
+
+    def test_serializer_blank_email_actor_falls_back_to_system(self):
+        """An actor with no first name and no "@" in the email is "System"."""
+        actor = User.objects.create_user(
+            username="noemail", email="", password=TEST_PASSWORD
+        )
+        notif = Notification.objects.create(
+            recipient=self.owner,
+            actor=actor,
+            child=self.child,
+            event_type=Notification.EventType.FEEDING,
+            message="Someone logged a feeding",
+        )
+        data = self._serialize(notif)
+        self.assertEqual(data["actor_name"], "System")
 
 
 class FeedingReminderLogModelTests(TestCase):
@@ -168,7 +214,8 @@ class NotificationPreferenceModelTests(TestCase):
 
     def test_preference_unique_together(self):
         NotificationPreference.objects.create(user=self.user, child=self.child)
-        with self.assertRaises(IntegrityError):
+        # Savepoint keeps the test transaction usable after the error
+        with self.assertRaises(IntegrityError), transaction.atomic():
             NotificationPreference.objects.create(user=self.user, child=self.child)
 
     def test_preference_str(self):
@@ -195,154 +242,59 @@ class QuietHoursModelTests(TestCase):
         self.assertEqual(qh.end_time, time(7, 0))
 
     def test_quiet_hours_disabled_is_not_quiet(self):
-        qh = QuietHours.objects.create(user=self.user, enabled=False)
+        qh = QuietHours(user=self.user, enabled=False)
         self.assertFalse(qh.is_quiet_now())
 
-    @patch("notifications.models.timezone.now")
-    def test_overnight_quiet_hours_during_quiet(self, mock_now):
-        """22:00-07:00 at 23:00 ET should be quiet."""
-        from datetime import datetime
-        from zoneinfo import ZoneInfo
-
-        # 23:00 ET = 04:00 UTC next day
-        mock_now.return_value = datetime(2024, 2, 26, 4, 0, 0, tzinfo=ZoneInfo("UTC"))
-        qh = QuietHours.objects.create(
-            user=self.user,
-            enabled=True,
-            start_time=time(22, 0),
-            end_time=time(7, 0),
-        )
-        self.assertTrue(qh.is_quiet_now())
+    def test_quiet_window_boundaries(self):
+        """Windows are checked in the user's timezone (ET), inclusive at both ends."""
+        # is_quiet_now only reads fields, so unsaved instances skip the INSERTs
+        overnight = (time(22, 0), time(7, 0))
+        same_day = (time(9, 0), time(17, 0))
+        cases = [
+            # (window, UTC now, expected); comments give ET wall time (UTC-5)
+            (overnight, datetime(2024, 2, 26, 4, 0, tzinfo=UTC), True),  # 23:00
+            (overnight, datetime(2024, 2, 26, 17, 0, tzinfo=UTC), False),  # 12:00
+            (overnight, datetime(2024, 2, 27, 3, 0, tzinfo=UTC), True),  # 22:00
+            (overnight, datetime(2024, 2, 26, 12, 0, tzinfo=UTC), True),  # 07:00
+            (same_day, datetime(2024, 2, 26, 17, 0, tzinfo=UTC), True),  # 12:00
+            (same_day, datetime(2024, 2, 27, 1, 0, tzinfo=UTC), False),  # 20:00
+            (same_day, datetime(2024, 2, 26, 14, 0, tzinfo=UTC), True),  # 09:00
+            (same_day, datetime(2024, 2, 26, 22, 0, tzinfo=UTC), True),  # 17:00
+            (same_day, datetime(2024, 2, 26, 22, 1, tzinfo=UTC), False),  # 17:01
+        ]
+        for (start, end), utc_now, expected in cases:
+            with self.subTest(start=start, end=end, utc_now=utc_now):
+                qh = QuietHours(
+                    user=self.user, enabled=True, start_time=start, end_time=end
+                )
+                self.assertIs(qh.is_quiet_now(utc_now), expected)
 
     @patch("notifications.models.timezone.now")
-    def test_overnight_quiet_hours_outside_quiet(self, mock_now):
-        """22:00-07:00 at 12:00 ET should NOT be quiet."""
-        from datetime import datetime
-        from zoneinfo import ZoneInfo
-
-        # 12:00 ET = 17:00 UTC
-        mock_now.return_value = datetime(2024, 2, 26, 17, 0, 0, tzinfo=ZoneInfo("UTC"))
-        qh = QuietHours.objects.create(
+    def test_quiet_hours_uses_given_now(self, mock_now):
+        """An explicit now is used instead of reading the clock."""
+        qh = QuietHours(
             user=self.user,
             enabled=True,
             start_time=time(22, 0),
             end_time=time(7, 0),
         )
-        self.assertFalse(qh.is_quiet_now())
-
-    @patch("notifications.models.timezone.now")
-    def test_same_day_quiet_hours_during_quiet(self, mock_now):
-        """09:00-17:00 at 12:00 ET should be quiet."""
-        from datetime import datetime
-        from zoneinfo import ZoneInfo
-
-        mock_now.return_value = datetime(2024, 2, 26, 17, 0, 0, tzinfo=ZoneInfo("UTC"))
-        qh = QuietHours.objects.create(
-            user=self.user,
-            enabled=True,
-            start_time=time(9, 0),
-            end_time=time(17, 0),
-        )
-        self.assertTrue(qh.is_quiet_now())
-
-    @patch("notifications.models.timezone.now")
-    def test_same_day_quiet_hours_outside_quiet(self, mock_now):
-        """09:00-17:00 at 20:00 ET should NOT be quiet."""
-        from datetime import datetime
-        from zoneinfo import ZoneInfo
-
-        # 20:00 ET = 01:00 UTC next day
-        mock_now.return_value = datetime(2024, 2, 27, 1, 0, 0, tzinfo=ZoneInfo("UTC"))
-        qh = QuietHours.objects.create(
-            user=self.user,
-            enabled=True,
-            start_time=time(9, 0),
-            end_time=time(17, 0),
-        )
-        self.assertFalse(qh.is_quiet_now())
-
-    @patch("notifications.models.timezone.now")
-    def test_overnight_quiet_hours_at_start_boundary(self, mock_now):
-        """22:00-07:00 at exactly 22:00 ET should be quiet (inclusive start)."""
-        from datetime import datetime
-        from zoneinfo import ZoneInfo
-
-        # 22:00 ET = 03:00 UTC next day
-        mock_now.return_value = datetime(2024, 2, 27, 3, 0, 0, tzinfo=ZoneInfo("UTC"))
-        qh = QuietHours.objects.create(
-            user=self.user,
-            enabled=True,
-            start_time=time(22, 0),
-            end_time=time(7, 0),
-        )
-        self.assertTrue(qh.is_quiet_now())
-
-    @patch("notifications.models.timezone.now")
-    def test_overnight_quiet_hours_at_end_boundary(self, mock_now):
-        """22:00-07:00 at exactly 07:00 ET should be quiet (inclusive end)."""
-        from datetime import datetime
-        from zoneinfo import ZoneInfo
-
-        # 07:00 ET = 12:00 UTC
-        mock_now.return_value = datetime(2024, 2, 26, 12, 0, 0, tzinfo=ZoneInfo("UTC"))
-        qh = QuietHours.objects.create(
-            user=self.user,
-            enabled=True,
-            start_time=time(22, 0),
-            end_time=time(7, 0),
-        )
-        self.assertTrue(qh.is_quiet_now())
-
-    @patch("notifications.models.timezone.now")
-    def test_same_day_quiet_hours_at_start_boundary(self, mock_now):
-        """09:00-17:00 at exactly 09:00 ET should be quiet (inclusive start)."""
-        from datetime import datetime
-        from zoneinfo import ZoneInfo
-
-        # 09:00 ET = 14:00 UTC
-        mock_now.return_value = datetime(2024, 2, 26, 14, 0, 0, tzinfo=ZoneInfo("UTC"))
-        qh = QuietHours.objects.create(
-            user=self.user,
-            enabled=True,
-            start_time=time(9, 0),
-            end_time=time(17, 0),
-        )
-        self.assertTrue(qh.is_quiet_now())
-
-    @patch("notifications.models.timezone.now")
-    def test_same_day_quiet_hours_at_end_boundary(self, mock_now):
-        """09:00-17:00 at exactly 17:00 ET should be quiet (inclusive end)."""
-        from datetime import datetime
-        from zoneinfo import ZoneInfo
-
-        # 17:00 ET = 22:00 UTC
-        mock_now.return_value = datetime(2024, 2, 26, 22, 0, 0, tzinfo=ZoneInfo("UTC"))
-        qh = QuietHours.objects.create(
-            user=self.user,
-            enabled=True,
-            start_time=time(9, 0),
-            end_time=time(17, 0),
-        )
-        self.assertTrue(qh.is_quiet_now())
+        # 23:00 ET = 04:00 UTC next day
+        now = datetime(2024, 2, 26, 4, 0, 0, tzinfo=UTC)
+        self.assertTrue(qh.is_quiet_now(now))
+        mock_now.assert_not_called()
 
-    @patch("notifications.models.timezone.now")
-    def test_same_day_quiet_hours_one_minute_after_end(self, mock_now):
-        """09:00-17:00 at 17:01 ET should NOT be quiet."""
-        from datetime import datetime
-        from zoneinfo import ZoneInfo
-
-        # 17:01 ET = 22:01 UTC
-        mock_now.return_value = datetime(2024, 2, 26, 22, 1, 0, tzinfo=ZoneInfo("UTC"))
-        qh = QuietHours.objects.create(
-            user=self.user,
-            enabled=True,
-            start_time=time(9, 0),
-            end_time=time(17, 0),
+    def test_quiet_hours_reuses_zoneinfo(self):
+        """Repeated checks resolve the user's timezone name only once."""
+        qh = QuietHours(
+            user=self.user, enabled=True, start_time=time(22, 0), end_time=time(7, 0)
         )
-        self.assertFalse(qh.is_quiet_now())
+        expected = qh.is_quiet_now()
+        with patch("notifications.models.ZoneInfo") as mock_zoneinfo:
+            self.assertEqual(qh.is_quiet_now(), expected)
+        mock_zoneinfo.assert_not_called()
 
     def test_quiet_hours_str(self):
-        qh = QuietHours.objects.create(user=self.user, enabled=True)
+        qh = QuietHours(user=self.user, enabled=True)
         self.assertIn("qh@example.com", str(qh))
         self.assertIn("ON", str(qh))
 
@@ -480,57 +432,42 @@ class NotificationTaskTests(TestCase):
         cls.child = Child.objects.create(
             parent=cls.owner, name="Baby Test", date_of_birth=date(2025, 6, 15)
         )
-        ChildShare.objects.create(
-            child=cls.child,
-            user=cls.coparent,
-            role=ChildShare.Role.CO_PARENT,
-            created_by=cls.owner,
-        )
-        ChildShare.objects.create(
-            child=cls.child,
-            user=cls.caregiver,
-            role=ChildShare.Role.CAREGIVER,
-            created_by=cls.owner,
+        ChildShare.objects.bulk_create(
+            ChildShare(child=cls.child, user=user, role=role, created_by=cls.owner)
+            for user, role in [
+                (cls.coparent, ChildShare.Role.CO_PARENT),
+                (cls.caregiver, ChildShare.Role.CAREGIVER),
+            ]
         )
 
+    def setUp(self):
+        """Clear cached preferences and members left by rolled-back tests."""
+        cache.clear()
+
     def test_creates_notifications_for_shared_users(self):
         """Caregiver logs feeding → owner and coparent get notifications."""
-        from .tasks import create_notifications_for_activity
-
         create_notifications_for_activity(
             child_id=self.child.id,
             actor_id=self.caregiver.id,
             event_type="feeding",
         )
         # Owner and coparent should get notifications, not caregiver
-        self.assertEqual(Notification.objects.filter(recipient=self.owner).count(), 1)
         self.assertEqual(
-            Notification.objects.filter(recipient=self.coparent).count(), 1
-        )
-        self.assertEqual(
-            Notification.objects.filter(recipient=self.caregiver).count(), 0
+            _recipient_counts(self.child), {self.owner.id: 1, self.coparent.id: 1}
         )
 
     def test_no_self_notification(self):
         """Owner logs diaper → only coparent and caregiver get notifications."""
-        from .tasks import create_notifications_for_activity
-
         create_notifications_for_activity(
             child_id=self.child.id,
             actor_id=self.owner.id,
             event_type="diaper",
         )
-        self.assertEqual(Notification.objects.filter(recipient=self.owner).count(), 0)
         self.assertEqual(
-            Notification.objects.filter(recipient=self.coparent).count(), 1
-        )
-        self.assertEqual(
-            Notification.objects.filter(recipient=self.caregiver).count(), 1
+            _recipient_counts(self.child), {self.coparent.id: 1, self.caregiver.id: 1}
         )
 
     def test_message_includes_actor_name_and_child(self):
-        from .tasks import create_notifications_for_activity
-
         create_notifications_for_activity(
             child_id=self.child.id,
             actor_id=self.caregiver.id,
@@ -541,10 +478,83 @@ class NotificationTaskTests(TestCase):
         self.assertIn("Baby Test", notif.message)
         self.assertIn("nap", notif.message)
 
+    def test_message_falls_back_to_actor_email(self):
+        """An actor without a first name is named by the email local part."""
+        actor = User.objects.create_user(
+            username="noname",
+            email="nofirstname@example.com",
+            password=TEST_PASSWORD,
+        )
+        create_notifications_for_activity(
+            child_id=self.child.id,
+            actor_id=actor.id,
+            event_type="diaper",
+        )
+        notif = Notification.objects.filter(recipient=self.owner).first()
+        self.assertEqual(notif.actor_id, actor.id)
+        self.assertTrue(notif.message.startswith("nofirstname logged"))
+
+    def test_child_loaded_without_parent_join(self):
+        """The child lookup reads only the columns the task uses."""
+        with CaptureQueriesContext(connection) as ctx:
+            create_notifications_for_activity(
+                child_id=self.child.id,
+                actor_id=self.caregiver.id,
+                event_type="feeding",
+            )
+        child_sql = ctx.captured_queries[0]["sql"]
+        self.assertIn('FROM "children_child"', child_sql)
+        self.assertNotIn("JOIN", child_sql)
+        self.assertNotIn('"children_child"."date_of_birth"', child_sql)
+
+    def test_quiet_hours_loaded_with_only_needed_user_columns(self):
+        """The quiet-hours query reads the user's timezone, not the whole user row."""
+        QuietHours.objects.create(
+            user=self.owner, enabled=True, start_time=time(0, 0), end_time=time(0, 0)
+        )
+        with CaptureQueriesContext(connection) as ctx:
+            create_notifications_for_activity(
+                child_id=self.child.id,
+                actor_id=self.caregiver.id,
+                event_type="feeding",
+            )
+        qh_sql = next(
+            q["sql"]
+            for q in ctx.captured_queries
+            if 'FROM "notifications_quiethours"' in q["sql"]
+        )
+        self.assertIn('"accounts_customuser"."timezone"', qh_sql)
+        self.assertNotIn('"accounts_customuser"."email"', qh_sql)
+
+    def test_preferences_served_from_cache_until_changed(self):
+        """Preferences are cached per (user, child) and dropped on save."""
+
+        def run_task():
+            with CaptureQueriesContext(connection) as ctx:
+                create_notifications_for_activity(
+                    child_id=self.child.id,
+                    actor_id=self.caregiver.id,
+                    event_type="feeding",
+                )
+            return [
+                q
+                for q in ctx.captured_queries
+                if 'FROM "notifications_notificationpreference"' in q["sql"]
+            ]
+
+        self.assertEqual(len(run_task()), 1)
+        self.assertEqual(run_task(), [])
+
+        NotificationPreference.objects.create(
+            user=self.owner, child=self.child, notify_feedings=False
+        )
+        Notification.objects.all().delete()
+        self.assertEqual(len(run_task()), 1)
+        self.assertFalse(Notification.objects.filter(recipient=self.owner).exists())
+        self.assertTrue(Notification.objects.filter(recipient=self.coparent).exists())
+
     def test_preference_suppresses_notification(self):
         """If owner disables feeding notifications for this child, skip them."""
-        from .tasks import create_notifications_for_activity
-
         NotificationPreference.objects.create(
             user=self.owner, child=self.child, notify_feedings=False
         )
@@ -554,16 +564,29 @@ class NotificationTaskTests(TestCase):
             event_type="feeding",
         )
         # Owner opted out of feedings, coparent should still get it
-        self.assertEqual(Notification.objects.filter(recipient=self.owner).count(), 0)
-        self.assertEqual(
-            Notification.objects.filter(recipient=self.coparent).count(), 1
-        )
+        self.assertEqual(_recipient_counts(self.child), {self.coparent.id: 1})
+
+    def test_all_recipients_opted_out_skips_quiet_hours(self):
+        """When every recipient opted out, the task stops before quiet hours."""
+        for user in (self.owner, self.coparent):
+            NotificationPreference.objects.create(
+                user=user, child=self.child, notify_naps=False
+            )
+        with CaptureQueriesContext(connection) as ctx:
+            result = create_notifications_for_activity(
+                child_id=self.child.id,
+                actor_id=self.caregiver.id,
+                event_type="nap",
+            )
+        self.assertEqual(result, "No eligible recipients")
+        self.assertFalse(
+            any("notifications_quiethours" in q["sql"] for q in ctx.captured_queries)
+        )
+        self.assertFalse(Notification.objects.exists())
 
     @patch("notifications.models.QuietHours.is_quiet_now", return_value=True)
     def test_quiet_hours_suppress_notification(self, mock_quiet):
         """Notifications not created during quiet hours."""
-        from .tasks import create_notifications_for_activity
-
         QuietHours.objects.create(user=self.owner, enabled=True)
         create_notifications_for_activity(
             child_id=self.child.id,
@@ -571,43 +594,89 @@ class NotificationTaskTests(TestCase):
             event_type="feeding",
         )
         # Owner in quiet hours, coparent should still get it
-        self.assertEqual(Notification.objects.filter(recipient=self.owner).count(), 0)
-        self.assertEqual(
-            Notification.objects.filter(recipient=self.coparent).count(), 1
-        )
+        self.assertEqual(_recipient_counts(self.child), {self.coparent.id: 1})
 
     def test_cleanup_old_notifications(self):
         """Cleanup task deletes notifications older than 30 days."""
-        from .tasks import cleanup_old_notifications
-
-        old_notif = Notification.objects.create(
-            recipient=self.owner,
-            actor=self.coparent,
-            child=self.child,
-            event_type="feeding",
-            message="Old notification",
-        )
-        # Manually backdate
+        old_notif, new_notif = Notification.objects.bulk_create(
+            [
+                Notification(
+                    recipient=self.owner,
+                    actor=self.coparent,
+                    child=self.child,
+                    event_type=event_type,
+                    message=message,
+                )
+                for event_type, message in [
+                    ("feeding", "Old notification"),
+                    ("diaper", "New notification"),
+                ]
+            ]
+        )
+        # auto_now_add overwrites created_at on insert, so backdate afterwards
         Notification.objects.filter(id=old_notif.id).update(
             created_at=timezone.now() - timezone.timedelta(days=31)
         )
-        new_notif = Notification.objects.create(
-            recipient=self.owner,
-            actor=self.coparent,
-            child=self.child,
-            event_type="diaper",
-            message="New notification",
-        )
         result = cleanup_old_notifications()
         self.assertIn("Deleted 1", result)
         self.assertIn("notification", result)
         self.assertFalse(Notification.objects.filter(id=old_notif.id).exists())
         self.assertTrue(Notification.objects.filter(id=new_notif.id).exists())
 
+    def test_cleanup_deletes_each_table_in_one_statement(self):
+        """Cleanup stays on Django's fast-delete path: one DELETE per table.
+
+        Adding delete signals or cascading relations to these models would
+        make delete() load and delete rows in batches instead. Notifications
+        take one extra query to select the batch of IDs.
+        """
+        old_notifs = Notification.objects.bulk_create(
+            [
+                Notification(
+                    recipient=self.owner,
+                    child=self.child,
+                    event_type="feeding",
+                    message=f"Old notification {i}",
+                )
+                for i in range(3)
+            ]
+        )
+        Notification.objects.filter(id__in=[n.id for n in old_notifs]).update(
+            created_at=timezone.now() - timezone.timedelta(days=31)
+        )
+        with self.assertNumQueries(5):
+            result = cleanup_old_notifications()
+        self.assertIn("Deleted 3 notifications", result)
+
+    def test_cleanup_reschedules_after_full_batch(self):
+        """A full batch of old notifications reschedules cleanup for the rest."""
+        old_notifs = Notification.objects.bulk_create(
+            [
+                Notification(
+                    recipient=self.owner,
+                    child=self.child,
+                    event_type="feeding",
+                    message=f"Old notification {i}",
+                )
+                for i in range(3)
+            ]
+        )
+        Notification.objects.filter(id__in=[n.id for n in old_notifs]).update(
+            created_at=timezone.now() - timezone.timedelta(days=31)
+        )
+        with patch.object(cleanup_old_notifications, "apply_async") as mock_async:
+            result = cleanup_old_notifications(batch_size=2)
+            self.assertIn("Deleted 2 notifications", result)
+            mock_async.assert_called_once_with(kwargs={"batch_size": 2}, countdown=1)
+
+            mock_async.reset_mock()
+            result = cleanup_old_notifications(batch_size=2)
+            self.assertIn("Deleted 1 notifications", result)
+            mock_async.assert_not_called()
+        self.assertFalse(Notification.objects.exists())
+
     def test_task_with_deleted_child(self):
         """Task handles missing child gracefully."""
-        from .tasks import create_notifications_for_activity
-
         result = create_notifications_for_activity(
             child_id=99999,
             actor_id=self.caregiver.id,
@@ -618,8 +687,6 @@ class NotificationTaskTests(TestCase):
 
     def test_task_with_deleted_actor(self):
         """Task handles missing actor gracefully."""
-        from .tasks import create_notifications_for_activity
-
         result = create_notifications_for_activity(
             child_id=self.child.id,
             actor_id=99999,
@@ -629,21 +696,18 @@ class NotificationTaskTests(TestCase):
         self.assertEqual(Notification.objects.count(), 0)
 
     def test_unknown_event_type_returns_early(self):
-        """Task rejects unknown event types without creating notifications."""
-        from .tasks import create_notifications_for_activity
-
-        result = create_notifications_for_activity(
-            child_id=self.child.id,
-            actor_id=self.caregiver.id,
-            event_type="unknown",
-        )
+        """Task rejects unknown event types before touching the database."""
+        with self.assertNumQueries(0):
+            result = create_notifications_for_activity(
+                child_id=self.child.id,
+                actor_id=self.caregiver.id,
+                event_type="unknown",
+            )
         self.assertIn("Unknown event type", result)
         self.assertEqual(Notification.objects.count(), 0)
 
     def test_task_returns_no_recipients_when_actor_is_only_member(self):
         """When only the child owner exists and actor is owner, returns 'No recipients'."""
-        from .tasks import create_notifications_for_activity
-
         # Child with no shares: only owner is in recipient set; actor = owner → empty after discard
         solo_child = Child.objects.create(
             parent=self.owner,
@@ -673,28 +737,49 @@ class SignalDispatchTests(TestCase):
             parent=cls.owner, name="Signal Baby", date_of_birth=date(2025, 6, 15)
         )
 
-    @patch("notifications.tasks.create_notifications_for_activity")
-    def test_signal_queues_celery_task(self, mock_task):
+    @patch.object(create_notifications_for_activity, "delay")
+    def test_signal_queues_celery_task(self, mock_delay):
         """tracking_created signal should call the Celery task."""
-        from diapers.models import DiaperChange
-
         instance = DiaperChange.objects.create(
             child=self.child,
             change_type=DiaperChange.ChangeType.WET,
             changed_at=timezone.now(),
         )
-        tracking_created.send(
-            sender=DiaperChange,
-            instance=instance,
-            actor_id=self.owner.id,
-            event_type="diaper",
-        )
-        mock_task.delay.assert_called_once_with(
+        with self.captureOnCommitCallbacks(execute=True):
+            tracking_created.send(
+                sender=DiaperChange,
+                instance=instance,
+                actor_id=self.owner.id,
+                event_type="diaper",
+            )
+        mock_delay.assert_called_once_with(
             child_id=self.child.id,
             actor_id=self.owner.id,
             event_type="diaper",
         )
 
+    @patch.object(create_notifications_for_activity, "delay")
+    def test_rolled_back_signal_queues_nothing(self, mock_delay):
+        """A signal sent inside a rolled-back transaction never queues the task."""
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    instance = DiaperChange.objects.create(
+                        child=self.child,
+                        change_type=DiaperChange.ChangeType.WET,
+                        changed_at=timezone.now(),
+                    )
+                    tracking_created.send(
+                        sender=DiaperChange,
+                        instance=instance,
+                        actor_id=self.owner.id,
+                        event_type="diaper",
+                    )
+                    raise IntegrityError
+            except IntegrityError:
+                pass
+        mock_delay.assert_not_called()
+
 
 class FeedingReminderTaskTests(TestCase):
     """Test the check_feeding_reminders Celery task."""
@@ -725,113 +810,75 @@ class FeedingReminderTaskTests(TestCase):
             date_of_birth=date(2025, 6, 15),
             feeding_reminder_interval=3,  # 3 hours
         )
-        ChildShare.objects.create(
-            child=cls.child,
-            user=cls.coparent,
-            role=ChildShare.Role.CO_PARENT,
-            created_by=cls.owner,
+        ChildShare.objects.bulk_create(
+            ChildShare(child=cls.child, user=user, role=role, created_by=cls.owner)
+            for user, role in [
+                (cls.coparent, ChildShare.Role.CO_PARENT),
+                (cls.caregiver, ChildShare.Role.CAREGIVER),
+            ]
         )
-        ChildShare.objects.create(
-            child=cls.child,
-            user=cls.caregiver,
-            role=ChildShare.Role.CAREGIVER,
-            created_by=cls.owner,
+
+    def _feed(self, child=None, **ago):
+        """Log a bottle feeding ``ago`` (timedelta kwargs) before now; return fed_at."""
+        fed_at = timezone.now() - timezone.timedelta(**ago)
+        Feeding.objects.create(
+            child=child or self.child,
+            feeding_type=Feeding.FeedingType.BOTTLE,
+            amount_oz=4,
+            fed_at=fed_at,
         )
+        return fed_at
 
     def test_no_reminder_without_feedings(self):
         """No reminders sent if child has no feedings (FR-REM-006)."""
-        from .tasks import check_feeding_reminders
-
         result = check_feeding_reminders()
         self.assertEqual(Notification.objects.filter(child=self.child).count(), 0)
         self.assertIn("Created 0", result)
 
     def test_initial_reminder_fires_at_threshold(self):
         """Initial reminder fires when time since feeding >= interval (AC-001)."""
-        from feedings.models import Feeding
-
         # Create feeding 3h 5m ago
-        last_fed_at = timezone.now() - timezone.timedelta(hours=3, minutes=5)
-        Feeding.objects.create(
-            child=self.child,
-            feeding_type=Feeding.FeedingType.BOTTLE,
-            amount_oz=4,
-            fed_at=last_fed_at,
-        )
-
-        from .tasks import check_feeding_reminders
+        last_fed_at = self._feed(hours=3, minutes=5)
 
         result = check_feeding_reminders()
         # Owner, coparent, and caregiver should all get notifications
         self.assertEqual(
-            Notification.objects.filter(child=self.child, recipient=self.owner).count(),
-            1,
-        )
-        self.assertEqual(
-            Notification.objects.filter(
-                child=self.child, recipient=self.coparent
-            ).count(),
-            1,
-        )
-        self.assertEqual(
-            Notification.objects.filter(
-                child=self.child, recipient=self.caregiver
-            ).count(),
-            1,
+            _recipient_counts(self.child),
+            {self.owner.id: 1, self.coparent.id: 1, self.caregiver.id: 1},
         )
         # Check FeedingReminderLog was created
-        from .models import FeedingReminderLog
-
         log = FeedingReminderLog.objects.filter(child=self.child, reminder_number=1)
         self.assertEqual(log.count(), 1)
         self.assertEqual(log.first().window_start, last_fed_at)
 
     def test_no_reminder_under_threshold(self):
         """No reminder if time since feeding < interval."""
-        from feedings.models import Feeding
-
         # Create feeding 2h 50m ago (before 3h threshold)
-        last_fed_at = timezone.now() - timezone.timedelta(hours=2, minutes=50)
-        Feeding.objects.create(
-            child=self.child,
-            feeding_type=Feeding.FeedingType.BOTTLE,
-            amount_oz=4,
-            fed_at=last_fed_at,
-        )
-
-        from .tasks import check_feeding_reminders
+        self._feed(hours=2, minutes=50)
 
         check_feeding_reminders()
         self.assertEqual(Notification.objects.filter(child=self.child).count(), 0)
 
     def test_repeat_reminder_fires_at_1_5x_threshold(self):
         """Repeat reminder fires when time since feeding >= interval * 1.5 (AC-002)."""
-        from feedings.models import Feeding
-
         # Create feeding 4h 35m ago (> 3 * 1.5 = 4.5h threshold)
-        last_fed_at = timezone.now() - timezone.timedelta(hours=4, minutes=35)
-        Feeding.objects.create(
-            child=self.child,
-            feeding_type=Feeding.FeedingType.BOTTLE,
-            amount_oz=4,
-            fed_at=last_fed_at,
-        )
-
-        from .models import FeedingReminderLog
+        last_fed_at = self._feed(hours=4, minutes=35)
 
         # Manually log that initial reminder was already sent
         FeedingReminderLog.objects.create(
             child=self.child, window_start=last_fed_at, reminder_number=1
         )
 
-        from .tasks import check_feeding_reminders
-
         check_feeding_reminders()
         # Should get both initial (from setup) and repeat reminders
         initial_notifs = Notification.objects.filter(
             child=self.child, recipient=self.owner
         )
         self.assertGreaterEqual(initial_notifs.count(), 1)
+        self.assertEqual(
+            initial_notifs.get().message,
+            "Baby still hasn't been fed (now 4 hours)",
+        )
 
         # Check repeat log was created
         repeat_log = FeedingReminderLog.objects.filter(
@@ -841,97 +888,61 @@ class FeedingReminderTaskTests(TestCase):
 
     def test_no_third_reminder(self):
         """Only two reminders per window (initial + repeat), no third (AC-003)."""
-        from feedings.models import Feeding
-
-        from .models import FeedingReminderLog
-
         # Create feeding 5h ago
-        last_fed_at = timezone.now() - timezone.timedelta(hours=5)
-        Feeding.objects.create(
-            child=self.child,
-            feeding_type=Feeding.FeedingType.BOTTLE,
-            amount_oz=4,
-            fed_at=last_fed_at,
-        )
+        last_fed_at = self._feed(hours=5)
 
         # Log both initial and repeat reminders
-        FeedingReminderLog.objects.create(
-            child=self.child, window_start=last_fed_at, reminder_number=1
+        FeedingReminderLog.objects.bulk_create(
+            FeedingReminderLog(
+                child=self.child, window_start=last_fed_at, reminder_number=n
+            )
+            for n in (1, 2)
         )
-        FeedingReminderLog.objects.create(
-            child=self.child, window_start=last_fed_at, reminder_number=2
-        )
-
-        # Clear any notifications from previous setup
-        Notification.objects.filter(child=self.child).delete()
-
-        from .tasks import check_feeding_reminders
 
         check_feeding_reminders()
         # No new notifications should be created
         self.assertEqual(Notification.objects.filter(child=self.child).count(), 0)
 
-    def test_log_reminder_sent_handles_duplicate_gracefully(self):
-        """_log_reminder_sent catches IntegrityError on duplicate (idempotent)."""
-        from unittest.mock import patch
-
-        from .models import FeedingReminderLog
-        from .tasks import _log_reminder_sent
-
+    def test_duplicate_reminder_log_is_ignored(self):
+        """A window already logged by a concurrent run doesn't raise (idempotent)."""
         last_fed_at = timezone.now() - timezone.timedelta(hours=4)
-        real_create = FeedingReminderLog.objects.create
-        call_count = [0]
-
-        def create_side_effect(*args, **kwargs):
-            call_count[0] += 1
-            if call_count[0] == 2:
-                raise IntegrityError("duplicate key")
-            return real_create(*args, **kwargs)
-
-        with patch.object(
-            FeedingReminderLog.objects, "create", side_effect=create_side_effect
-        ):
-            _log_reminder_sent(self.child, last_fed_at, 1)
-            _log_reminder_sent(self.child, last_fed_at, 1)
-        self.assertEqual(call_count[0], 2)
+        FeedingReminderLog.objects.create(
+            child=self.child, window_start=last_fed_at, reminder_number=1
+        )
+
+        _send_reminder_notifications(
+            [],
+            [
+                FeedingReminderLog(
+                    child=self.child, window_start=last_fed_at, reminder_number=1
+                )
+            ],
+        )
+        self.assertEqual(FeedingReminderLog.objects.filter(child=self.child).count(), 1)
 
     def test_window_reset_on_new_feeding(self):
         """New feeding resets reminder window (AC-004)."""
-        from feedings.models import Feeding
-
-        from .models import FeedingReminderLog
-
-        # Create old feeding 5h ago
+        # Old feeding 5h ago and a new feeding 10 minutes ago
         old_fed_at = timezone.now() - timezone.timedelta(hours=5)
-        Feeding.objects.create(
-            child=self.child,
-            feeding_type=Feeding.FeedingType.BOTTLE,
-            amount_oz=4,
-            fed_at=old_fed_at,
+        new_fed_at = timezone.now() - timezone.timedelta(minutes=10)
+        Feeding.objects.bulk_create(
+            Feeding(
+                child=self.child,
+                feeding_type=Feeding.FeedingType.BOTTLE,
+                amount_oz=4,
+                fed_at=fed_at,
+            )
+            for fed_at in (old_fed_at, new_fed_at)
         )
 
         # Log reminders for old feeding
-        FeedingReminderLog.objects.create(
-            child=self.child, window_start=old_fed_at, reminder_number=1
-        )
-        FeedingReminderLog.objects.create(
-            child=self.child, window_start=old_fed_at, reminder_number=2
-        )
-
-        # Create new feeding 10 minutes ago
-        new_fed_at = timezone.now() - timezone.timedelta(minutes=10)
-        Feeding.objects.create(
-            child=self.child,
-            feeding_type=Feeding.FeedingType.BOTTLE,
-            amount_oz=4,
-            fed_at=new_fed_at,
+        FeedingReminderLog.objects.bulk_create(
+            FeedingReminderLog(
+                child=self.child, window_start=old_fed_at, reminder_number=n
+            )
+            for n in (1, 2)
         )
 
-        # Clear notifications
-        Notification.objects.filter(child=self.child).delete()
-
-        from .tasks import check_feeding_reminders
-
         check_feeding_reminders()
         # No reminder should fire (< 3h since new feeding)
         self.assertEqual(Notification.objects.filter(child=self.child).count(), 0)
@@ -943,13 +954,7 @@ class FeedingReminderTaskTests(TestCase):
             date_of_birth=date(2025, 6, 15),
             feeding_reminder_interval=3,
         )
-        old_fed_at2 = timezone.now() - timezone.timedelta(hours=3, minutes=5)
-        Feeding.objects.create(
-            child=child2,
-            feeding_type=Feeding.FeedingType.BOTTLE,
-            amount_oz=4,
-            fed_at=old_fed_at2,
-        )
+        self._feed(hours=3, minutes=5, child=child2)
 
         check_feeding_reminders()
         # Reminder should fire for child2
@@ -957,56 +962,29 @@ class FeedingReminderTaskTests(TestCase):
 
     def test_notify_feedings_preference_respected(self):
         """Reminders respect notify_feedings preference (AC-006, FR-REM-009)."""
-        from feedings.models import Feeding
-
         # Create feeding 3h 5m ago
-        last_fed_at = timezone.now() - timezone.timedelta(hours=3, minutes=5)
-        Feeding.objects.create(
-            child=self.child,
-            feeding_type=Feeding.FeedingType.BOTTLE,
-            amount_oz=4,
-            fed_at=last_fed_at,
-        )
+        self._feed(hours=3, minutes=5)
 
         # Disable feedings for owner
         NotificationPreference.objects.create(
             user=self.owner, child=self.child, notify_feedings=False
         )
 
-        from .tasks import check_feeding_reminders
-
         check_feeding_reminders()
         # Owner should NOT get reminder, coparent should
-        self.assertEqual(
-            Notification.objects.filter(child=self.child, recipient=self.owner).count(),
-            0,
-        )
-        self.assertEqual(
-            Notification.objects.filter(
-                child=self.child, recipient=self.coparent
-            ).count(),
-            1,
-        )
+        counts = _recipient_counts(self.child)
+        self.assertEqual(counts[self.owner.id], 0)
+        self.assertEqual(counts[self.coparent.id], 1)
 
     @patch("notifications.models.QuietHours.is_quiet_now", return_value=True)
     def test_quiet_hours_bypassed_for_reminders(self, mock_quiet):
         """Reminders bypass quiet hours (AC-007, FR-REM-008)."""
-        from feedings.models import Feeding
-
         # Create feeding 3h 5m ago
-        last_fed_at = timezone.now() - timezone.timedelta(hours=3, minutes=5)
-        Feeding.objects.create(
-            child=self.child,
-            feeding_type=Feeding.FeedingType.BOTTLE,
-            amount_oz=4,
-            fed_at=last_fed_at,
-        )
+        self._feed(hours=3, minutes=5)
 
         # Create quiet hours for owner
         QuietHours.objects.create(user=self.owner, enabled=True)
 
-        from .tasks import check_feeding_reminders
-
         check_feeding_reminders()
         # Even though owner is in quiet hours, reminder should be sent
         # (because reminders bypass quiet hours per spec)
@@ -1020,36 +998,16 @@ class FeedingReminderTaskTests(TestCase):
         self.child.feeding_reminder_interval = None
         self.child.save()
 
-        from feedings.models import Feeding
-
         # Create feeding 5h ago
-        last_fed_at = timezone.now() - timezone.timedelta(hours=5)
-        Feeding.objects.create(
-            child=self.child,
-            feeding_type=Feeding.FeedingType.BOTTLE,
-            amount_oz=4,
-            fed_at=last_fed_at,
-        )
-
-        from .tasks import check_feeding_reminders
+        self._feed(hours=5)
 
         check_feeding_reminders()
         self.assertEqual(Notification.objects.filter(child=self.child).count(), 0)
 
     def test_idempotency_prevents_duplicates(self):
         """Running task twice doesn't create duplicate reminders (FR-REM-011)."""
-        from feedings.models import Feeding
-
         # Create feeding 3h 5m ago
-        last_fed_at = timezone.now() - timezone.timedelta(hours=3, minutes=5)
-        Feeding.objects.create(
-            child=self.child,
-            feeding_type=Feeding.FeedingType.BOTTLE,
-            amount_oz=4,
-            fed_at=last_fed_at,
-        )
-
-        from .tasks import check_feeding_reminders
+        self._feed(hours=3, minutes=5)
 
         # Run task twice
         check_feeding_reminders()
@@ -1061,20 +1019,92 @@ class FeedingReminderTaskTests(TestCase):
         # Should be the same (idempotent)
         self.assertEqual(notif_count_first, notif_count_second)
 
-    def test_reminder_notification_event_type(self):
-        """Reminder notifications have event_type='feeding_reminder'."""
-        from feedings.models import Feeding
+    def test_shares_loaded_once_for_all_children(self):
+        """Recipient lookup reuses the prefetched shares instead of one query per child."""
+        child2 = Child.objects.create(
+            parent=self.owner,
+            name="Baby 2",
+            date_of_birth=date(2025, 6, 15),
+            feeding_reminder_interval=3,
+        )
+        for child in (self.child, child2):
+            self._feed(child, hours=3, minutes=5)
+
+        with CaptureQueriesContext(connection) as ctx:
+            check_feeding_reminders()
+        share_queries = [
+            q for q in ctx.captured_queries if "children_childshare" in q["sql"]
+        ]
+        self.assertEqual(len(share_queries), 1)
+        self.assertEqual(Notification.objects.filter(child=self.child).count(), 3)
+        self.assertEqual(Notification.objects.filter(child=child2).count(), 1)
+
+    def test_lookups_batched_across_children(self):
+        """Feedings, preferences, and reminder logs are loaded once for all children."""
+        children = [self.child] + [
+            Child.objects.create(
+                parent=self.owner,
+                name=f"Baby {i}",
+                date_of_birth=date(2025, 6, 15),
+                feeding_reminder_interval=3,
+            )
+            for i in range(3)
+        ]
+        # Due, but already reminded, so the run stops before any writes
+        FeedingReminderLog.objects.bulk_create(
+            FeedingReminderLog(
+                child=child,
+                window_start=self._feed(child, hours=3, minutes=5),
+                reminder_number=1,
+            )
+            for child in children
+        )
+
+        # children with last feeding and sent logs, prefetched shares, preferences
+        with self.assertNumQueries(3):
+            check_feeding_reminders()
+
+    def test_children_not_yet_due_are_not_loaded(self):
+        """Children fed within their interval are filtered out in SQL."""
+        self._feed(hours=1)
+
+        # Only the children query; no shares or preferences to fetch
+        with self.assertNumQueries(1):
+            result = check_feeding_reminders()
+        self.assertIn("Created 0", result)
 
-        # Create feeding 3h 5m ago
-        last_fed_at = timezone.now() - timezone.timedelta(hours=3, minutes=5)
-        Feeding.objects.create(
-            child=self.child,
-            feeding_type=Feeding.FeedingType.BOTTLE,
-            amount_oz=4,
-            fed_at=last_fed_at,
+    def test_reminders_for_all_children_inserted_together(self):
+        """Initial and repeat reminders for every child share one INSERT."""
+        child2 = Child.objects.create(
+            parent=self.owner,
+            name="Baby 2",
+            date_of_birth=date(2025, 6, 15),
+            feeding_reminder_interval=3,
+        )
+        for child in (self.child, child2):
+            self._feed(child, hours=5)
+
+        with CaptureQueriesContext(connection) as ctx:
+            result = check_feeding_reminders()
+        inserts = [
+            q
+            for q in ctx.captured_queries
+            if q["sql"].startswith('INSERT INTO "notifications_notification"')
+        ]
+        self.assertEqual(len(inserts), 1)
+        # (owner + 2 shares) * 2 reminders + owner * 2 reminders
+        self.assertIn("Created 8", result)
+        self.assertEqual(
+            Notification.objects.filter(
+                child=self.child, message__startswith="Baby still"
+            ).count(),
+            3,
         )
 
-        from .tasks import check_feeding_reminders
+    def test_reminder_notification_event_type(self):
+        """Reminder notifications have event_type='feeding_reminder'."""
+        # Create feeding 3h 5m ago
+        self._feed(hours=3, minutes=5)
 
         check_feeding_reminders()
         notif = Notification.objects.filter(child=self.child).first()
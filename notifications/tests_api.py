@@ -3,6 +3,7 @@
 from datetime import date
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from rest_framework import status
 from rest_framework.authtoken.models import Token
 from rest_framework.test import APITestCase
@@ -11,6 +12,7 @@ from children.models import Child, ChildShare
 from django_project.test_constants import TEST_PASSWORD
 
 from .models import Notification, NotificationPreference, QuietHours
+from .serializers import NotificationSerializer
 
 User = get_user_model()
 
@@ -39,10 +41,9 @@ class NotificationAPITests(APITestCase):
         cls.child = Child.objects.create(
             parent=cls.user, name="Baby Notif", date_of_birth=date(2025, 6, 15)
         )
+        cls.token = Token.objects.create(user=cls.user)
 
     def setUp(self):
-        self.token = Token.objects.create(user=self.user)
-        self.other_token = Token.objects.create(user=self.other_user)
         self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
 
     def _create_notification(self, recipient=None, is_read=False, message="Test"):
@@ -78,6 +79,36 @@ class NotificationAPITests(APITestCase):
         self.assertIn("child_name", result)
         self.assertEqual(result["child_name"], "Baby Notif")
 
+    def test_list_query_count_independent_of_rows(self):
+        """Actor and child names come from the page query, not one query per row."""
+        for i in range(5):
+            self._create_notification(message=f"Note {i}")
+        Notification.objects.create(
+            recipient=self.user,
+            child=self.child,
+            event_type=Notification.EventType.FEEDING_REMINDER,
+            message="Reminder",
+        )
+        # token, COUNT, page
+        with self.assertNumQueries(3):
+            response = self.client.get(URL_NOTIFICATIONS)
+        names = {r["message"]: r["actor_name"] for r in response.data["results"]}
+        self.assertEqual(names["Note 0"], "other")
+        self.assertEqual(names["Reminder"], "System")
+
+    def test_list_serializer_caches_readable_fields(self):
+        """Readable fields are computed once and reused for every row."""
+        for i in range(3):
+            self._create_notification(message=f"Note {i}")
+        serializer = NotificationSerializer(
+            NotificationSerializer.setup_eager_loading(Notification.objects.all()),
+            many=True,
+        )
+        self.assertEqual(len(serializer.data), 3)
+        readable = serializer.child._readable_fields
+        self.assertIsInstance(readable, list)
+        self.assertIs(serializer.child._readable_fields, readable)
+
     def test_list_unauthenticated(self):
         self.client.credentials()
         response = self.client.get(URL_NOTIFICATIONS)
@@ -109,6 +140,20 @@ class NotificationAPITests(APITestCase):
             Notification.objects.filter(recipient=self.user, is_read=False).count(), 0
         )
 
+    def test_mark_all_read_skips_update_when_cached_count_is_zero(self):
+        self.client.get(f"{URL_NOTIFICATIONS}unread-count/")  # caches 0
+        # token only
+        with self.assertNumQueries(1):
+            response = self.client.post(f"{URL_NOTIFICATIONS}mark-all-read/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["updated"], 0)
+
+    def test_mark_all_read_after_new_notification_updates(self):
+        self.client.get(f"{URL_NOTIFICATIONS}unread-count/")  # caches 0
+        self._create_notification(is_read=False)
+        response = self.client.post(f"{URL_NOTIFICATIONS}mark-all-read/")
+        self.assertEqual(response.data["updated"], 1)
+
     def test_mark_single_read(self):
         notif = self._create_notification(is_read=False)
         response = self.client.patch(f"{URL_NOTIFICATIONS}{notif.id}/")
@@ -154,10 +199,10 @@ class NotificationPreferenceAPITests(APITestCase):
             role=ChildShare.Role.CO_PARENT,
             created_by=cls.user,
         )
+        cls.token = Token.objects.create(user=cls.user)
+        cls.other_token = Token.objects.create(user=cls.other_user)
 
     def setUp(self):
-        self.token = Token.objects.create(user=self.user)
-        self.other_token = Token.objects.create(user=self.other_user)
         self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
 
     def test_list_auto_creates_preferences(self):
@@ -171,6 +216,27 @@ class NotificationPreferenceAPITests(APITestCase):
         self.assertEqual(response.data[0]["child_name"], "Baby Pref")
         self.assertTrue(response.data[0]["notify_feedings"])
 
+    def test_list_reuses_cached_child_ids(self):
+        """A repeat listing reads accessible child IDs from the cache."""
+        self.client.get(URL_NOTIFICATIONS_PREFERENCES)  # warm cache, create rows
+        # token, existing preferences, preference list
+        with self.assertNumQueries(3):
+            response = self.client.get(URL_NOTIFICATIONS_PREFERENCES)
+        self.assertEqual(len(response.data), 1)
+
+    def test_list_after_owner_deletes_shared_child(self):
+        """A shared user's listing skips a child the owner has deleted."""
+        self.addCleanup(cache.clear)  # the rollback restores rows, not the cache
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.other_token.key}")
+        self.client.get(URL_NOTIFICATIONS_PREFERENCES)  # warm the access cache
+        self.child.delete()
+        response = self.client.get(URL_NOTIFICATIONS_PREFERENCES)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [])
+        self.assertFalse(
+            NotificationPreference.objects.filter(user=self.other_user).exists()
+        )
+
     def test_list_shows_only_own_preferences(self):
         """Each user sees only their own preferences."""
         self.client.get(URL_NOTIFICATIONS_PREFERENCES)  # auto-create for user
@@ -221,9 +287,9 @@ class QuietHoursAPITests(APITestCase):
             email="qhuser@example.com",
             password=TEST_PASSWORD,
         )
+        cls.token = Token.objects.create(user=cls.user)
 
     def setUp(self):
-        self.token = Token.objects.create(user=self.user)
         self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
 
     def test_get_auto_creates_quiet_hours(self):
@@ -565,3 +565,35 @@ class CheckPatternAlertsTests(TestCase):
             recipient=self.owner, event_type="pattern_alert"
         ).exists()
         mock_push.assert_not_called()
+
+    @patch("notifications.fcm.send_push_to_user")
+    @patch("analytics.utils.compute_pattern_alerts")
+    def test_loads_only_needed_columns(self, mock_compute, mock_push):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from notifications.models import NotificationPreference
+        from notifications.tasks import check_pattern_alerts
+
+        NotificationPreference.objects.create(user=self.owner, child=self.child)
+        mock_compute.return_value = {
+            "child_id": self.child.id,
+            "feeding": {"alert": False, "message": None, "last_fed_at": None},
+            "nap": {"alert": False, "message": None, "last_nap_ended_at": None},
+        }
+
+        with CaptureQueriesContext(connection) as ctx:
+            check_pattern_alerts()
+
+        children_sql = next(
+            q["sql"]
+            for q in ctx.captured_queries
+            if 'FROM "children_child"' in q["sql"]
+        )
+        assert "accounts_customuser" not in children_sql
+        prefs_sql = next(
+            q["sql"]
+            for q in ctx.captured_queries
+            if 'FROM "notifications_notificationpreference"' in q["sql"]
+        )
+        assert "notify_diapers" not in prefs_sql
@@ -42,10 +42,10 @@ class NotificationViewSet(viewsets.ModelViewSet):
     http_method_names = ["get", "patch", "post"]
 
     def get_queryset(self):
-        return (
-            Notification.objects.filter(recipient=self.request.user)
-            .select_related("actor", "child")
-            .order_by("-created_at")
+        return NotificationSerializer.setup_eager_loading(
+            Notification.objects.filter(recipient=self.request.user).order_by(
+                "-created_at"
+            )
         )
 
     @action(detail=False, methods=["get"], url_path="unread-count")
@@ -62,7 +62,13 @@ class NotificationViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=["post"], url_path="mark-all-read")
     def mark_all_read(self, request):
-        """Mark all unread notifications as read."""
+        """Mark all unread notifications as read.
+
+        A cached unread count of zero means there is nothing to update, so
+        the write is skipped (clients call this on every screen focus).
+        """
+        if cache.get(unread_count_cache_key(request.user.id)) == 0:
+            return Response({"updated": 0})
         updated = Notification.objects.filter(
             recipient=request.user, is_read=False
         ).update(is_read=True)
@@ -102,9 +108,8 @@ class NotificationPreferenceViewSet(viewsets.ModelViewSet):
 
     def list(self, request, *args, **kwargs):
         """Ensure preferences exist for all accessible children before listing."""
-        accessible_child_ids = list(
-            Child.for_user(request.user).values_list("id", flat=True)
-        )
+        # Cached alongside Child.for_user, so a warm cache skips this query
+        accessible_child_ids = Child.accessible_ids(request.user)
         existing_child_ids = set(
             NotificationPreference.objects.filter(
                 user=request.user, child_id__in=accessible_child_ids
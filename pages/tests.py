@@ -1,4 +1,6 @@
 import json
+from pathlib import Path
+from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
 from django.test import TestCase
@@ -95,6 +97,18 @@ class ServiceWorkerTests(TestCase):
         view = resolve("/sw.js")
         self.assertEqual(view.func.__name__, ServiceWorkerView.as_view().__name__)
 
+    def test_service_worker_revalidates_by_etag(self):
+        self.assertEqual(self.response["Cache-Control"], "max-age=0, must-revalidate")
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=self.response["ETag"])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_service_worker_read_once(self):
+        with patch.object(Path, "read_bytes") as mock_read:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        mock_read.assert_not_called()
+
 
 class PWAMetaTagsTests(TestCase):
     """Test that PWA meta tags are present in the base template."""
@@ -124,21 +138,22 @@ class PWAMetaTagsTests(TestCase):
 class ManifestTests(TestCase):
     """Test that the manifest.json file is valid and contains required fields."""
 
-    def _load_manifest(self):
-        """Load manifest.json directly from the static directory."""
-        from pathlib import Path
+    @classmethod
+    def setUpTestData(cls):
+        """Load and parse manifest.json once for the whole class.
 
+        Fails every test in the class if the file is not valid JSON.
+        """
         from django.conf import settings
 
         manifest_path = Path(settings.BASE_DIR) / "static" / "manifest.json"
-        return json.loads(manifest_path.read_text())
+        cls.manifest = json.loads(manifest_path.read_text())
 
     def test_manifest_is_valid_json(self):
-        # Will raise json.JSONDecodeError if invalid, failing the test
-        self._load_manifest()
+        self.assertIsInstance(self.manifest, dict)
 
     def test_manifest_contains_required_fields(self):
-        manifest = self._load_manifest()
+        manifest = self.manifest
         self.assertIn("name", manifest)
         self.assertIn("short_name", manifest)
         self.assertIn("start_url", manifest)
@@ -146,7 +161,7 @@ class ManifestTests(TestCase):
         self.assertIn("icons", manifest)
 
     def test_manifest_has_correct_values(self):
-        manifest = self._load_manifest()
+        manifest = self.manifest
         self.assertEqual(manifest["short_name"], "PoopyFeed")
         self.assertEqual(manifest["theme_color"], "#74C0FC")
         self.assertEqual(manifest["display"], "standalone")
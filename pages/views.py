@@ -1,8 +1,12 @@
+import hashlib
+from functools import lru_cache
 from pathlib import Path
 
 from django.conf import settings
 from django.http import HttpResponse
+from django.utils.decorators import method_decorator
 from django.views import View
+from django.views.decorators.http import etag
 from django.views.generic import TemplateView
 
 
@@ -14,12 +18,32 @@ class OfflinePageView(TemplateView):
     template_name = "pwa/offline.html"
 
 
+@lru_cache(maxsize=1)
+def _service_worker():
+    """Return (content, etag) for the service worker, read once per process."""
+    sw_path = Path(settings.BASE_DIR) / "static" / "js" / "service-worker.js"
+    content = sw_path.read_bytes()
+    return content, hashlib.md5(content, usedforsecurity=False).hexdigest()
+
+
+def _service_worker_etag(request):
+    if settings.DEBUG:
+        # Pick up edits to the file without restarting the dev server
+        _service_worker.cache_clear()
+    return _service_worker()[1]
+
+
 class ServiceWorkerView(View):
-    """Serve service worker at root scope with correct headers."""
+    """Serve service worker at root scope with correct headers.
+
+    The file never changes at runtime, so it is read once and revalidated
+    by ETag; an unchanged worker is answered with 304 and no body.
+    """
 
+    @method_decorator(etag(_service_worker_etag))
     def get(self, request):
-        sw_path = Path(settings.BASE_DIR) / "static" / "js" / "service-worker.js"
-        content = sw_path.read_text()
+        content, _ = _service_worker()
         response = HttpResponse(content, content_type="application/javascript")
         response["Service-Worker-Allowed"] = "/"
+        response["Cache-Control"] = "max-age=0, must-revalidate"
         return response